@@ -0,0 +1,39 @@
+"""Measures the throughput of the available CRC32C backends."""
+import os
+from timeit import Timer
+
+from tensorboard_easy.utils import CRC_BACKENDS
+
+SIZES = [16, 256, 4 << 10, 64 << 10, 1 << 20, 16 << 20]
+
+
+def measure(func, data, min_time=.2):
+    timer = Timer(lambda: func(data))
+    number, total = timer.autorange()
+    while total < min_time:
+        number *= 2
+        total = timer.timeit(number)
+    return len(data) * number / total
+
+
+def main():
+    print('%10s' % 'size' + ''.join('%14s' % name for name in CRC_BACKENDS))
+    for size in SIZES:
+        data = os.urandom(size)
+        if size > (1 << 20):
+            # the pure python implementation takes minutes on large buffers
+            backends = {name: func for name, func in CRC_BACKENDS.items() if name != 'crccheck'}
+        else:
+            backends = CRC_BACKENDS
+
+        row = '%10d' % size
+        for name in CRC_BACKENDS:
+            if name in backends:
+                row += '%10.2f MB/s' % (measure(backends[name], data) / 2 ** 20)
+            else:
+                row += '%14s' % '-'
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
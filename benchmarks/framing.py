@@ -0,0 +1,70 @@
+"""
+Compares the previous framing of records, which wrote the length, its CRC, the data and its CRC
+by separate calls, with framing them into a single buffer, which is written by a single call.
+
+The records are written to the null device, so that the disk speed is excluded.
+"""
+import os
+import struct
+from timeit import Timer
+
+from tensorboard_easy.utils import encode
+from tensorboard_easy.writer import EventFileWriter
+from tensorboard_easy.wire import encode_scalar_event, encode_image_value, encode_event
+
+
+class SeparateWritesWriter(EventFileWriter):
+    """The previous implementation."""
+
+    def write(self, record: bytes):
+        header = struct.pack('Q', len(record))
+        self.file.write(header)
+        self.file.write(struct.pack('I', encode(header)))
+        self.file.write(record)
+        self.file.write(struct.pack('I', encode(record)))
+
+        self._unflushed_events += 1
+        self._unflushed_bytes += len(record) + 16
+        if (self.flush_events is not None and self._unflushed_events >= self.flush_events) or \
+                (self.flush_bytes is not None and self._unflushed_bytes >= self.flush_bytes):
+            self.flush()
+        else:
+            self.poll()
+
+
+RECORDS = {
+    'scalar': encode_scalar_event(1510000000, 100, 'loss', 0.5),
+    'image': encode_event(1510000000, 100, [
+        encode_image_value('image', 128, 128, 3, os.urandom(128 * 128 * 3))]),
+}
+
+
+def measure(writer, record, batch: int = None):
+    if batch is None:
+        def func():
+            writer.write(record)
+    else:
+        records = [record] * batch
+
+        def func():
+            writer.write_many(records)
+
+    number, total = Timer(func).autorange()
+    return number * (batch or 1) / total
+
+
+def main():
+    for flush_events in [1, None]:
+        print('flush_events=%s' % flush_events)
+        for name, record in RECORDS.items():
+            separate = SeparateWritesWriter(os.devnull, flush_events)
+            single = EventFileWriter(os.devnull, flush_events)
+            print('%10s (%5d bytes): separate writes %9.0f records/s, single write %9.0f records/s, '
+                  'batches of 64 %9.0f records/s' % (name, len(record), measure(separate, record),
+                                                      measure(single, record), measure(single, record, 64)))
+            separate.close()
+            single.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares decoding each event in Python with `read_scalars`, which parses the events written by `log_scalar`
+and `log_scalars` with numpy.
+"""
+import os
+import tempfile
+from time import perf_counter
+
+from tensorboard_easy.reader import read_records, read_scalars
+from tensorboard_easy.wire import encode_scalar_event, encode_scalars_event, decode_scalars
+from tensorboard_easy.writer import EventFileWriter
+
+TAGS = ['train/loss', 'train/accuracy', 'lr', 'val/loss']
+
+
+def decode_each(path):
+    result = {}
+    for record in read_records(path, verify=False):
+        wall_time, step, scalars = decode_scalars(record)
+        for tag, value in scalars:
+            result.setdefault(tag, []).append((step, wall_time, value))
+    return result
+
+
+def main(steps: int = 250000):
+    with tempfile.TemporaryDirectory() as folder:
+        for layout in ['log_scalar', 'log_scalars']:
+            path = os.path.join(folder, 'events.out.tfevents.%s' % layout)
+            writer = EventFileWriter(path, flush_events=None)
+            for step in range(steps):
+                if layout == 'log_scalar':
+                    for tag in TAGS:
+                        writer.write(encode_scalar_event(1510000000 + step, step, tag, step / 7))
+                else:
+                    writer.write(encode_scalars_event(1510000000 + step, step, TAGS, [step / 7] * len(TAGS)))
+            writer.close()
+
+            count = steps * len(TAGS)
+            for name, func in [('decode each event', decode_each), ('read_scalars', read_scalars)]:
+                start = perf_counter()
+                func(path)
+                elapsed = perf_counter() - start
+                print('%12s, %20s: %6.2f s, %10.0f scalars/s' % (layout, name, elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,9 @@
-from distutils.core import setup
-from setuptools import find_packages
+from setuptools import setup, find_packages
 
 classifiers = '''Development Status :: 5 - Production/Stable
-Programming Language :: Python :: 3.4
-Programming Language :: Python :: 3.5
-Programming Language :: Python :: 3.6'''
+Programming Language :: Python :: 3.7
+Programming Language :: Python :: 3.8
+Programming Language :: Python :: 3.9'''
 
 with open('README.rst', encoding='utf-8') as file:
     long_description = file.read()
@@ -25,10 +24,19 @@ setup(
         'tensorboard', 'logging'
     ],
     classifiers=classifiers.splitlines(),
+    python_requires='>=3.7',
     install_requires=[
         'Pillow>=4.3',
         'protobuf>=3.4',
         'crccheck>=0.6',
-        'numpy>=1.11',
-    ]
+        'numpy>=1.15',
+    ],
+    extras_require={
+        'fast': ['crc32c'],
+    },
+    entry_points={
+        'console_scripts': [
+            'tensorboard-easy-report = tensorboard_easy.report:main',
+        ],
+    },
 )
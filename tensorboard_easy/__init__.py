@@ -1 +1,2 @@
 from .logger import Logger
+from .histogram import HistogramAccumulator
@@ -0,0 +1,138 @@
+"""
+Logging from asyncio coroutines without blocking the event loop.
+"""
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Union, Iterable, Dict, Sequence
+
+import numpy as np
+
+from .histogram import HistogramAccumulator
+from .logger import Logger
+
+
+class AsyncLogger:
+    """
+    An asyncio counterpart of `Logger`: each `log_*` method is a coroutine.
+
+    The encoding of events (e.g. images or histograms) runs in `executor`, and the file is written
+    by a background thread in batches, so the event loop is never blocked on CPU-bound work or disk I/O.
+
+    Parameters
+    ----------
+    path: str
+        the logs folder.
+    executor: Executor, optional
+        where the events are encoded. By default the event loop's default executor is used.
+    kwargs
+        the other arguments of `Logger`. By default `async_write` is True.
+
+    Examples
+    --------
+    >>> async with AsyncLogger('/path/to/logs/folder/') as log:
+    ...     await log.log_scalar('accuracy', 0.9, step)
+    """
+
+    def __init__(self, path, executor: Executor = None, **kwargs):
+        kwargs.setdefault('async_write', True)
+        self.logger = Logger(path, **kwargs)
+        self.executor = executor
+
+    @property
+    def filename(self):
+        return self.logger.filename
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _run(self, method, *args, **kwargs):
+        # the logger is thread-safe, so several events can be encoded concurrently
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(method, *args, **kwargs))
+
+    async def flush(self):
+        """Waits until all the logged events are written to disk."""
+        await self._run(self.logger.flush)
+
+    async def close(self):
+        await self._run(self.logger.close)
+
+    @staticmethod
+    def _make_log(tag, first_step, method, **schedule):
+        log = Logger._make_log(tag, first_step, method, **schedule)
+
+        async def wrapper(value):
+            # the skipped steps return None instead of a coroutine
+            result = log(value)
+            if result is not None:
+                await result
+
+        return wrapper
+
+    def make_log_scalar(self, tag: str, first_step: int = 0, **schedule):
+        """
+        Creates a shortcut coroutine function, that writes to a tag and increments the step.
+        `schedule` accepts `every`, `min_interval` and `log_scale`, see `Logger.make_log_scalar`.
+        """
+        return self._make_log(tag, first_step, self.log_scalar, **schedule)
+
+    def make_log_image(self, tag: str, first_step: int = 0, **schedule):
+        """Analog to `make_log_scalar`"""
+        return self._make_log(tag, first_step, self.log_image, **schedule)
+
+    def make_log_audio(self, tag: str, sample_rate: int, first_step: int = 0, **schedule):
+        """Analog to `make_log_scalar`"""
+        async def method(tag, waveform, step):
+            await self.log_audio(tag, waveform, sample_rate, step)
+
+        return self._make_log(tag, first_step, method, **schedule)
+
+    def make_log_text(self, tag: str, first_step: int = 0, **schedule):
+        """Analog to `make_log_scalar`"""
+        return self._make_log(tag, first_step, self.log_text, **schedule)
+
+    def make_log_histogram(self, tag: str, first_step: int = 0, every: int = None, min_interval: float = None,
+                           log_scale: bool = False, **kwargs):
+        """Analog to `make_log_scalar`. `kwargs` are passed to `log_histogram`."""
+        return self._make_log(tag, first_step, functools.partial(self.log_histogram, **kwargs),
+                              every=every, min_interval=min_interval, log_scale=log_scale)
+
+    async def log_scalar(self, tag: str, value: Union[int, float], step: int):
+        """See `Logger.log_scalar`."""
+        await self._run(self.logger.log_scalar, tag, value, step)
+
+    async def log_scalars(self, values: Dict[str, Union[int, float]], step: int):
+        """See `Logger.log_scalars`."""
+        await self._run(self.logger.log_scalars, values, step)
+
+    async def log_scalars_from_arrays(self, tags: Sequence[str], values: np.array, step: int):
+        """See `Logger.log_scalars_from_arrays`."""
+        await self._run(self.logger.log_scalars_from_arrays, tags, values, step)
+
+    async def log_image(self, tag: str, image: np.array, step: int, **kwargs):
+        """See `Logger.log_image`."""
+        await self._run(self.logger.log_image, tag, image, step, **kwargs)
+
+    async def log_images(self, tag: str, batch: np.array, step: int, **kwargs):
+        """See `Logger.log_images`."""
+        await self._run(self.logger.log_images, tag, batch, step, **kwargs)
+
+    async def log_histogram(self, tag: str, data: Union[np.array, HistogramAccumulator], step: int, **kwargs):
+        """See `Logger.log_histogram`."""
+        await self._run(self.logger.log_histogram, tag, data, step, **kwargs)
+
+    async def log_audio(self, tag: str, waveform: np.array, sample_rate: int, step: int):
+        """See `Logger.log_audio`."""
+        await self._run(self.logger.log_audio, tag, waveform, sample_rate, step)
+
+    async def log_tensor(self, tag: str, array: np.array, step: int):
+        """See `Logger.log_tensor`."""
+        await self._run(self.logger.log_tensor, tag, array, step)
+
+    async def log_text(self, tag: str, tensor: Union[str, Iterable], step: int):
+        """See `Logger.log_text`."""
+        await self._run(self.logger.log_text, tag, tensor, step)
@@ -0,0 +1,58 @@
+import wave
+from io import BytesIO
+
+import numpy as np
+
+_INT16_MIN, _INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+
+def to_pcm16(waveform: np.ndarray) -> np.ndarray:
+    """
+    Converts a waveform of shape N (mono) or CxN (C channels) to interleaved 16-bit samples of shape NxC.
+
+    Floating point samples are expected to be in [-1, 1], they are clipped and scaled by 32767.
+    Integer samples are full-scale PCM of their bit depth: they are shifted to 16 bits,
+    e.g. int32 by 16 bits right and int8 by 8 bits left. Unsigned samples are centered at the middle
+    of their range, as in 8-bit WAV.
+    """
+    waveform = np.asarray(waveform)
+    if waveform.ndim == 1:
+        waveform = waveform[None]
+    if waveform.ndim != 2:
+        raise ValueError('Expected an array of shape N or CxN, got %s' % (waveform.shape,))
+
+    # a view with the channels interleaved
+    waveform = waveform.T
+    out = np.empty(waveform.shape, '<i2')
+    dtype = waveform.dtype
+    if np.issubdtype(dtype, np.integer):
+        shift = 8 * dtype.itemsize - 16
+        if shift < 0:
+            np.left_shift(waveform, -shift, out=out, dtype=np.int16)
+        elif shift > 0:
+            np.copyto(out, np.right_shift(waveform, shift), casting='unsafe')
+        else:
+            np.copyto(out, waveform, casting='unsafe')
+        if np.issubdtype(dtype, np.unsignedinteger):
+            # flipping the sign bit subtracts 32768 from the 16-bit unsigned value
+            np.bitwise_xor(out, _INT16_MIN, out=out)
+    elif np.issubdtype(dtype, np.floating):
+        scratch = np.clip(waveform, -1, 1, dtype=np.float64)
+        np.multiply(scratch, _INT16_MAX, out=scratch)
+        np.rint(scratch, out=scratch)
+        np.copyto(out, scratch, casting='unsafe')
+    else:
+        raise TypeError('Cannot convert tensor of type %s to audio' % dtype)
+
+    return out
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encodes 16-bit samples of shape NxC to WAV."""
+    with BytesIO() as output:
+        with wave.open(output, 'wb') as file:
+            file.setnchannels(samples.shape[1])
+            file.setsampwidth(2)
+            file.setframerate(sample_rate)
+            file.writeframes(memoryview(np.ascontiguousarray(samples)).cast('B'))
+        return output.getvalue()
@@ -0,0 +1,263 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+Histogram = namedtuple('Histogram', ['min', 'max', 'num', 'sum', 'sum_squares', 'bucket_limit', 'bucket'])
+LAYOUTS = ('linear', 'exponential')
+SAMPLINGS = ('random', 'strided')
+
+
+@lru_cache(1)
+def exponential_bucket_limits() -> np.ndarray:
+    """The default bucket limits used by Tensorflow: +-1e-12 * 1.1 ** k up to 1e20, zero and +-DBL_MAX."""
+    positive = []
+    value = 1e-12
+    while value < 1e20:
+        positive.append(value)
+        value *= 1.1
+    positive.append(np.finfo(np.float64).max)
+
+    limits = np.array([-x for x in reversed(positive)] + [0.] + positive)
+    limits.flags.writeable = False
+    return limits
+
+
+def compact_buckets(bucket_limit: np.ndarray, bucket: np.ndarray):
+    """Collapses each run of empty buckets into a single one, the same way Tensorflow does."""
+    empty = bucket == 0
+    # an empty bucket is kept only if it ends a run of empty buckets
+    keep = ~empty
+    keep[:-1] |= empty[:-1] & ~empty[1:]
+    keep[-1] = True
+    return bucket_limit[keep], bucket[keep]
+
+
+def _exponential_counts(data: np.ndarray) -> np.ndarray:
+    limits = exponential_bucket_limits()
+    # bucket i contains the values in [limits[i - 1], limits[i])
+    indices = np.minimum(np.searchsorted(limits, data, side='right'), len(limits) - 1)
+    return np.bincount(indices, minlength=len(limits))
+
+
+def sample_values(data: np.ndarray, size: int, sampling: str = 'random', seed: int = 0) -> np.ndarray:
+    """
+    Takes `size` elements of `data` without copying or traversing the whole array.
+
+    Parameters
+    ----------
+    data: np.ndarray
+    size: int
+    sampling: str, optional
+        'random' - uniformly with replacement, 'strided' - evenly spaced in the flattened array.
+    seed: int, optional
+        the seed for random sampling.
+    """
+    if sampling not in SAMPLINGS:
+        raise ValueError('Unknown sampling: %r' % sampling)
+
+    if sampling == 'random':
+        indices = np.random.RandomState(seed).randint(0, data.size, size)
+    else:
+        indices = np.arange(size) * data.size // size
+
+    if data.flags.c_contiguous:
+        return data.reshape(-1)[indices]
+    return data[np.unravel_index(indices, data.shape)]
+
+
+def compute_histogram(data: np.ndarray, num_bars: int = 30, layout: str = 'linear', sample_size: int = None,
+                      sampling: str = 'random', seed: int = 0, exact_stats: bool = True) -> Histogram:
+    """
+    Computes a histogram of `data`.
+
+    Parameters
+    ----------
+    data: np.ndarray
+    num_bars: int, optional
+        the number of buckets for the linear layout.
+    layout: str, optional
+        'linear' - `num_bars` equal buckets spanning the range of `data`,
+        'exponential' - fixed exponential buckets, the same as in Tensorflow, with the empty ones compacted.
+    sample_size: int, optional
+        if `data` is larger, the buckets are counted over a sample of this size
+        and scaled to the size of `data`.
+    sampling: str, optional
+        how to sample the data: 'random' or 'strided'.
+    seed: int, optional
+        the seed for random sampling.
+    exact_stats: bool, optional
+        whether to compute min, max, sum and sum of squares over the whole data, when sampling.
+        Otherwise they are estimated from the sample as well.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError('Unknown layout: %r' % layout)
+
+    data = np.asarray(data)
+    num = data.size
+    if not num:
+        raise ValueError('The histogram is empty')
+    if sample_size is None or num <= sample_size:
+        values = data.ravel()
+        exact_stats = True
+    else:
+        values = sample_values(data, sample_size, sampling, seed)
+    scale = num / values.size
+
+    if exact_stats:
+        min_, max_ = data.min(), data.max()
+        sum_ = data.sum()
+        if data.flags.c_contiguous:
+            sum_sq = data.reshape(-1).dot(data.reshape(-1))
+        else:
+            # avoids copying the data
+            axes = ''.join(chr(ord('a') + i) for i in range(data.ndim))
+            sum_sq = np.einsum('%s,%s->' % (axes, axes), data, data)
+    else:
+        min_, max_ = values.min(), values.max()
+        sum_ = values.sum() * scale
+        sum_sq = values.dot(values) * scale
+
+    if layout == 'exponential':
+        bucket_limit, bucket = compact_buckets(exponential_bucket_limits(), _exponential_counts(values))
+    elif min_ == max_:
+        bucket_limit = [min_]
+        bucket = [values.size]
+    else:
+        bucket, bucket_limit = np.histogram(values, num_bars, range=(min_, max_))
+        bucket_limit = bucket_limit[1:]
+
+    if scale != 1:
+        bucket = np.asarray(bucket) * scale
+    return Histogram(min_, max_, num, sum_, sum_sq, bucket_limit, bucket)
+
+
+def _power_of_two(value: float) -> float:
+    """The smallest power of two that is >= `value`."""
+    if value == 0:
+        return 0.
+    mantissa, exponent = np.frexp(value)
+    if mantissa == .5:
+        exponent -= 1
+    return float(np.ldexp(1., exponent))
+
+
+class HistogramAccumulator:
+    """
+    Computes a histogram of arbitrarily large data fed in chunks, in a single pass and with bounded memory.
+
+    The buckets have equal widths, which are powers of two aligned to zero. When new data doesn't fit
+    into the current buckets, the width is doubled and the counts are merged, which is exact for aligned
+    buckets. As a result, there are between `num_bars` and `2 * num_bars` buckets.
+
+    With the 'exponential' layout the buckets are fixed, the same as in Tensorflow.
+
+    Parameters
+    ----------
+    num_bars: int, optional
+        the minimal number of buckets spanning the data range for the linear layout.
+    chunk_size: int, optional
+        the number of elements processed at once. Bounds the size of temporary buffers.
+    layout: str, optional
+        'linear' or 'exponential'.
+
+    Examples
+    --------
+    >>> hist = HistogramAccumulator()
+    >>> hist.update(*[param.data.cpu().numpy() for param in model.parameters()])
+    >>> logger.log_histogram('weights', hist, step)
+    """
+
+    def __init__(self, num_bars: int = 30, chunk_size: int = 1 << 20, layout: str = 'linear'):
+        if layout not in LAYOUTS:
+            raise ValueError('Unknown layout: %r' % layout)
+
+        self.layout = layout
+        self.num_bars = num_bars
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.sum = self.sum_squares = 0.
+        self.min = np.inf
+        self.max = -np.inf
+
+        if layout == 'exponential':
+            self._capacity = len(exponential_bucket_limits())
+        else:
+            self._capacity = 2 * num_bars
+        self._counts = np.zeros(self._capacity)
+        self._width = None
+        # the index of the first bucket: it covers [first * width, (first + 1) * width)
+        self._first = 0
+
+    @property
+    def bucket_width(self) -> float:
+        return self._width
+
+    def update(self, *arrays: np.ndarray):
+        """Adds the values of each array to the histogram. Returns the accumulator itself."""
+        for array in arrays:
+            array = np.asarray(array)
+            if not array.size:
+                continue
+
+            chunks = np.nditer(array, flags=['external_loop', 'buffered', 'zerosize_ok'], order='K',
+                               op_dtypes=[np.float64], casting='unsafe', buffersize=self.chunk_size)
+            for chunk in chunks:
+                self._update_chunk(chunk)
+        return self
+
+    def _update_chunk(self, chunk):
+        min_, max_ = chunk.min(), chunk.max()
+        if not np.isfinite(min_) or not np.isfinite(max_):
+            raise ValueError('The data contains non-finite values')
+
+        self.count += len(chunk)
+        self.sum += chunk.sum()
+        self.sum_squares += chunk.dot(chunk)
+        self.min = min(self.min, min_)
+        self.max = max(self.max, max_)
+
+        if self.layout == 'exponential':
+            self._counts += _exponential_counts(chunk)
+            return
+
+        self._fit(self.min, self.max)
+        indices = np.floor(chunk / self._width).astype(np.int64) - self._first
+        self._counts += np.bincount(indices, minlength=self._capacity)
+
+    def _fit(self, min_, max_):
+        """Rescales the buckets so that they cover [min_, max_]."""
+        # keeps the bucket indices within the float precision
+        resolution = max(_power_of_two(max(abs(min_), abs(max_)) * 2. ** -52), 2. ** -1022)
+        if self._width is None:
+            self._width = max(_power_of_two((max_ - min_) / self.num_bars), resolution)
+            self._first = int(np.floor(min_ / self._width))
+
+        width = self._width
+        while width < resolution or np.floor(max_ / width) - np.floor(min_ / width) >= self._capacity:
+            width *= 2
+        # the width is multiplied by 2 ** shift, so the indices are divided by it
+        shift = min(np.frexp(width)[1] - np.frexp(self._width)[1], 63)
+        indices = (self._first + np.arange(self._capacity)) >> shift
+        nonzero = self._counts > 0
+        # `min_ / width` might underflow
+        first = min(int(np.floor(min_ / width)), int(indices[nonzero].min(initial=indices[-1])))
+        if width == self._width and first == self._first:
+            return
+
+        self._counts = np.bincount(indices[nonzero] - first, self._counts[nonzero], minlength=self._capacity)
+        self._width, self._first = width, first
+
+    def result(self) -> Histogram:
+        if not self.count:
+            raise ValueError('The histogram is empty')
+
+        if self.layout == 'exponential':
+            bucket_limit, bucket = compact_buckets(exponential_bucket_limits(), self._counts)
+            return Histogram(self.min, self.max, self.count, self.sum, self.sum_squares, bucket_limit, bucket)
+
+        nonzero = np.flatnonzero(self._counts)
+        start, stop = nonzero[0], nonzero[-1] + 1
+        bucket_limit = (self._first + np.arange(start, stop) + 1) * self._width
+        return Histogram(self.min, self.max, self.count, self.sum, self.sum_squares,
+                         bucket_limit, self._counts[start:stop])
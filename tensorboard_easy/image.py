@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+COLOR_SPACES = {
+    1: 'L',  # grayScale
+    3: 'RGB',
+    4: 'RGBA',
+}
+IMAGE_FORMATS = ('bmp', 'png', 'jpeg')
+# the number of values scaled at once, so that the float buffer stays in the cache
+_CHUNK_SIZE = 1 << 14
+
+
+def to_uint8(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts an image to uint8 in a single pass over `image`, writing the result to `out`.
+    The values are scaled in small chunks, so no float copy of the whole image is made.
+
+    uint8 images are left as is, bool images are mapped to {0, 255}, uint16 images are shifted by 8 bits,
+    floating point images in [0, 1] are scaled by 255, integers in [0, 255] are cast,
+    the rest are min-max scaled to [0, 255]. The scaled values are rounded to the nearest integer.
+
+    Parameters
+    ----------
+    image: np.ndarray
+        an image of any layout, e.g. a transposed view.
+    out: np.ndarray, optional
+        uint8 buffer of the same shape as `image`.
+    """
+    dtype = image.dtype
+    if dtype == np.uint8 and out is None:
+        return image
+    if out is None:
+        out = np.empty(image.shape, np.uint8)
+
+    if dtype == np.uint8:
+        np.copyto(out, image)
+    elif dtype == np.bool_:
+        np.multiply(image, 255, out=out, dtype=np.uint8)
+    elif dtype == np.uint16:
+        np.right_shift(image, 8, out=out, casting='unsafe')
+    elif np.issubdtype(dtype, np.number):
+        min_, max_ = image.min(), image.max()
+        if np.issubdtype(dtype, np.integer) and min_ >= 0 and max_ <= 255:
+            np.copyto(out, image, casting='unsafe')
+            return out
+
+        if np.issubdtype(dtype, np.floating) and min_ >= 0 and max_ <= 1:
+            min_, range_ = 0., 1.
+        else:
+            min_, range_ = float(min_), (float(max_) - float(min_) if max_ > min_ else np.inf)
+
+        # chunks of whole rows along the first axis
+        step = max(1, _CHUNK_SIZE * len(image) // image.size)
+        scratch = np.empty((min(step, len(image)),) + image.shape[1:], np.float64)
+        for start in range(0, len(image), step):
+            chunk = scratch[:len(image[start:start + step])]
+            # float32 images are scaled in float64 as well, otherwise some values are rounded differently
+            np.subtract(image[start:start + step], min_, out=chunk, dtype=np.float64)
+            np.divide(chunk, range_, out=chunk)
+            np.multiply(chunk, 255, out=chunk)
+            # the values are non-negative, so truncation after adding .5 rounds them
+            np.add(chunk, .5, out=chunk)
+            np.copyto(out[start:start + step], chunk, casting='unsafe')
+    else:
+        raise TypeError('Cannot convert tensor of type %s to image' % dtype)
+
+    return out
+
+
+class ImageConverter:
+    """
+    Converts arrays to uint8 images, reusing the output buffer of the previous conversion with the same key.
+
+    Only the buffers of the `max_buffers` most recently used keys are kept.
+    """
+
+    def __init__(self, max_buffers: int = 16):
+        self.max_buffers = max_buffers
+        self._buffers = OrderedDict()
+
+    def __call__(self, image: np.ndarray, key=None) -> np.ndarray:
+        if image.dtype == np.uint8 and image.flags.c_contiguous:
+            return image
+        if key is None or not self.max_buffers:
+            return to_uint8(image, np.empty(image.shape, np.uint8))
+
+        out = self._buffers.pop(key, None)
+        if out is None or out.shape != image.shape:
+            out = np.empty(image.shape, np.uint8)
+        self._buffers[key] = out
+        if len(self._buffers) > self.max_buffers:
+            self._buffers.popitem(last=False)
+        return to_uint8(image, out)
+
+
+def to_pil(image: np.ndarray, converter: ImageConverter = None, key=None) -> Image.Image:
+    """
+    Converts an array of shape 3xMxN (RGB), 4xMxN (RGBA), MxN or 1xMxN (grayScale) to a Pillow image.
+
+    The layout is changed and the values are converted to uint8 in a single pass, see `to_uint8`.
+    If `converter` is given, its buffer for `key` is reused. In this case the resulting image
+    might share memory with it, and will be overwritten by the next conversion with the same key.
+    """
+    assert image.ndim in [2, 3]
+
+    if image.ndim == 3:
+        mode = len(image)
+        if mode == 1:
+            image = image[0]
+        else:
+            image = np.transpose(image, (1, 2, 0))
+    else:
+        mode = 1
+
+    if mode not in COLOR_SPACES:
+        raise TypeError('Cannot convert tensor of shape %s '
+                        'to image' % (image.shape,))
+
+    if converter is None:
+        converter = ImageConverter()
+    return Image.fromarray(converter(image, key))
+
+
+def normalize_batch(batch: np.ndarray) -> np.ndarray:
+    """
+    Scales each image in `batch` to the range 0-255 independently. The result is uint8.
+    bool images are mapped to {0, 255}, as in `to_uint8`.
+    """
+    if batch.dtype == np.bool_:
+        return batch.astype(np.uint8) * np.uint8(255)
+    if not np.issubdtype(batch.dtype, np.floating):
+        # integers would overflow or be truncated
+        batch = batch.astype(np.float64)
+    axes = tuple(range(1, batch.ndim))
+    min_ = batch.min(axis=axes, keepdims=True)
+    scale = batch.max(axis=axes, keepdims=True) - min_
+    scale[scale == 0] = 1
+    return ((batch - min_) * (255 / scale) + .5).astype(np.uint8)
+
+
+def make_grid(batch: np.ndarray, columns: int = None, padding: int = 2, pad_value=0,
+              normalize: bool = False) -> np.ndarray:
+    """
+    Tiles a batch of images into a single image.
+
+    Parameters
+    ----------
+    batch: np.ndarray
+        array of shape NxCxHxW or NxHxW.
+    columns: int, optional
+        the number of images in a row. By default the grid is close to a square.
+    padding: int, optional
+        the distance between neighbouring images.
+    pad_value: optional
+        the value used for padding and for the empty cells of the grid.
+    normalize: bool, optional
+        whether to scale each image to the range 0-255 independently. The result is uint8.
+
+    Returns
+    -------
+    grid: np.ndarray
+        array of shape Cx(rows * (H + padding) - padding)x(columns * (W + padding) - padding)
+    """
+    batch = np.asarray(batch)
+    if batch.ndim == 3:
+        batch = batch[:, None]
+    if batch.ndim != 4:
+        raise ValueError('Expected an array of shape NxCxHxW or NxHxW, got %s' % (batch.shape,))
+
+    if normalize:
+        batch = normalize_batch(batch)
+        pad_value = 0
+
+    count, channels, height, width = batch.shape
+    if columns is None:
+        columns = int(np.ceil(np.sqrt(count)))
+    rows = int(np.ceil(count / columns))
+
+    grid = np.full((rows * columns, channels, height + padding, width + padding), pad_value, batch.dtype)
+    grid[:count, :, :height, :width] = batch
+    # (rows, columns, C, H, W) -> (C, rows, H, columns, W)
+    grid = grid.reshape(rows, columns, channels, height + padding, width + padding).transpose(2, 0, 3, 1, 4)
+    grid = grid.reshape(channels, rows * (height + padding), columns * (width + padding))
+    # no padding after the last row and column
+    return grid[:, :grid.shape[1] - padding, :grid.shape[2] - padding]
+
+
+def encode_image(image: Image.Image, image_format: str = 'bmp', png_compression: int = 6,
+                 jpeg_quality: int = 75) -> bytes:
+    """
+    Encodes a Pillow image to bytes.
+
+    Parameters
+    ----------
+    image: Image
+    image_format: str, optional
+        'bmp' - fast, but large, 'png' - lossless compression, 'jpeg' - lossy compression.
+    png_compression: int, optional
+        zlib compression level from 0 (none) to 9 (best).
+    jpeg_quality: int, optional
+        from 1 (worst) to 95 (best).
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError('Unknown image format: %r' % image_format)
+
+    if image_format == 'png':
+        options = dict(compress_level=png_compression)
+    elif image_format == 'jpeg':
+        options = dict(quality=jpeg_quality)
+        # jpeg doesn't support transparency
+        if image.mode == 'RGBA':
+            image = image.convert('RGB')
+    else:
+        options = {}
+
+    with BytesIO() as output:
+        image.save(output, image_format.upper(), **options)
+        return output.getvalue()
@@ -1,34 +1,159 @@
 import os
 import socket
-import struct
-from time import time
-from io import BytesIO
-from typing import Union, Iterable
+import threading
+from time import time, monotonic
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Iterable, Dict, Sequence
 
 import functools
-from PIL import Image
 import numpy as np
 
-from .proto.event_pb2 import Event
-from .proto.summary_pb2 import Summary, HistogramProto, SummaryMetadata
-from .proto.tensor_pb2 import TensorProto
-from .proto.tensor_shape_pb2 import TensorShapeProto
 from .proto import types_pb2 as tensor_type
-from .utils import *
+from .proto.event_pb2 import SessionLog
+from .writer import EventFileWriter, AsyncEventFileWriter, check_queue_options
+from .histogram import HistogramAccumulator, compute_histogram
+from .image import COLOR_SPACES, IMAGE_FORMATS, ImageConverter, to_pil, encode_image, make_grid, \
+    normalize_batch
+from .audio import to_pcm16, encode_wav
+from .wire import encode_event, encode_scalar_event, encode_scalars_event, encode_histogram_value, \
+    encode_image_value, encode_audio_value, encode_tensor_event, encode_text_value, encode_metadata, \
+    encode_file_version_event, encode_session_log_event
 
-COLOR_SPACES = {
-    1: 'L',  # grayScale
-    3: 'RGB',
-    4: 'RGBA',
+TEXT_METADATA = encode_metadata('text', '{}')
+TENSOR_TYPES = {
+    np.dtype(np.float16): tensor_type.DT_HALF,
+    np.dtype(np.float32): tensor_type.DT_FLOAT,
+    np.dtype(np.float64): tensor_type.DT_DOUBLE,
+    np.dtype(np.int8): tensor_type.DT_INT8,
+    np.dtype(np.int16): tensor_type.DT_INT16,
+    np.dtype(np.int32): tensor_type.DT_INT32,
+    np.dtype(np.int64): tensor_type.DT_INT64,
+    np.dtype(np.uint8): tensor_type.DT_UINT8,
+    np.dtype(np.uint16): tensor_type.DT_UINT16,
+    np.dtype(np.complex64): tensor_type.DT_COMPLEX64,
+    np.dtype(np.complex128): tensor_type.DT_COMPLEX128,
+    np.dtype(np.bool_): tensor_type.DT_BOOL,
 }
 
 
+def _is_log_scale_step(step: int) -> bool:
+    """Whether `step` is a single digit followed by zeros."""
+    if step < 10:
+        return True
+    return step % 10 ** (len(str(step)) - 1) == 0
+
+
 class Logger:
-    def __init__(self, path):
+    """
+    Writes events to a new file inside `path`. The logger can be shared between threads.
+
+    Parameters
+    ----------
+    path: str
+        the logs folder.
+    flush_events: int, optional
+        flush the file after this many events. By default every event is flushed.
+    flush_bytes: int, optional
+        flush the file after this many bytes.
+    flush_secs: float, optional
+        flush the file at most this many seconds after an event is logged, even if nothing is logged afterwards.
+        If all the `flush_*` arguments are None, the file is flushed only by `flush` and `close`.
+    async_write: bool, optional
+        whether to write the events from a background thread instead of blocking the caller.
+    max_queue: int, optional
+        the maximal number of events waiting to be written in the asynchronous mode.
+    overflow: str, optional
+        what to do when the queue is full in the asynchronous mode:
+        'block', 'drop_oldest' or 'drop_newest'.
+    image_format: str, optional
+        the default encoding of images: 'bmp' (fast, but large), 'png' or 'jpeg'.
+    png_compression: int, optional
+        zlib compression level from 0 to 9.
+    jpeg_quality: int, optional
+        from 1 (worst) to 95 (best).
+    image_workers: int, optional
+        the number of threads that encode images in parallel. By default images are encoded
+        by the calling thread.
+    max_bytes: int, optional
+        start a new file once the current one has reached this size.
+    max_age: float, optional
+        start a new file after an event is written to a file older than this many seconds.
+        By default all the events are written to a single file.
+    tag_prefix: str, optional
+        prepended to all the tags, e.g. "worker1/".
+    start_step: int, optional
+        if given, a `SessionLog.START` event with this step is written on creation, and `SessionLog.STOP`
+        on close. TensorBoard uses it to discard the events with steps >= `start_step` left in the folder
+        by a previous run, e.g. one that crashed after the last checkpoint.
+    """
+
+    def __init__(self, path, flush_events: int = 1, flush_bytes: int = None,
+                 flush_secs: float = None, async_write: bool = False, max_queue: int = 1024,
+                 overflow: str = 'block', image_format: str = 'bmp', png_compression: int = 6,
+                 jpeg_quality: int = 75, image_workers: int = 0, max_bytes: int = None,
+                 max_age: float = None, tag_prefix: str = '', start_step: int = None):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError('Unknown image format: %r' % image_format)
+        # the options are checked before any file is created
+        if async_write:
+            check_queue_options(max_queue, overflow)
+        self.image_format = image_format
+        self.png_compression = png_compression
+        self.jpeg_quality = jpeg_quality
+        self._image_executor = None
+        self._pending_images = deque()
+        # each thread converts images in its own buffers
+        self._local = threading.local()
+        # limits the memory taken by the images waiting to be encoded
+        self._max_pending_images = 4 * image_workers
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._flush_policy = flush_events, flush_bytes, flush_secs
+        self._async_options = (max_queue, overflow) if async_write else None
+
+        self.tag_prefix = tag_prefix
+        self.start_step = start_step
+
+        # guards the current file, its state and the pending images
+        self._lock = threading.RLock()
         os.makedirs(path, exist_ok=True)
-        self.filename = os.path.join(path, 'events.out.tfevents.%f.%s' %
-                                     (time(), socket.gethostname()))
-        self.file = open(self.filename, 'wb')
+        self._open()
+        if start_step is not None:
+            self._write_to_file(encode_session_log_event(time(), start_step, SessionLog.START))
+        if image_workers:
+            self._image_executor = ThreadPoolExecutor(image_workers)
+
+    def _open(self):
+        """Starts a new events file."""
+        filename = None
+        # the names must be unique, even if the files are opened within the same microsecond
+        while filename is None or os.path.exists(filename):
+            filename = os.path.join(self.path, 'events.out.tfevents.%f.%s.%d' %
+                                    (time(), socket.gethostname(), os.getpid()))
+
+        self.filename = filename
+        self._writer = EventFileWriter(filename, *self._flush_policy)
+        if self._async_options is not None:
+            self._writer = AsyncEventFileWriter(self._writer, *self._async_options)
+        self._file_bytes = 0
+        self._file_opened = monotonic()
+        # the metadata must be repeated in each file
+        self._tags_with_metadata = set()
+        self._write_to_file(encode_file_version_event(time()))
+
+    def _write_to_file(self, record: bytes):
+        """Writes a record to the current file without triggering rotation."""
+        self._check_open()
+        self._writer.write(record)
+        # the record's length and CRCs take 16 bytes
+        self._file_bytes += len(record) + 16
+
+    def _check_open(self):
+        if self._writer is None:
+            raise ValueError('Logging to a closed logger')
 
     def __enter__(self):
         return self
@@ -36,58 +161,130 @@ class Logger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def _write_event(self, tag, step, **kwargs):
-        summary = Summary()
-        summary.value.add(tag=tag, **kwargs)
-        event = Event(wall_time=time(), summary=summary, step=step)
-        event = event.SerializeToString()
-        header = struct.pack('Q', len(event))
-        self.file.write(header)
-        self.file.write(struct.pack('I', encode(header)))
-        self.file.write(event)
-        self.file.write(struct.pack('I', encode(event)))
-        self.file.flush()
+    def _write_record(self, record: bytes):
+        with self._lock:
+            self._write_to_file(record)
+            if (self.max_bytes is not None and self._file_bytes >= self.max_bytes) or \
+                    (self.max_age is not None and monotonic() - self._file_opened >= self.max_age):
+                self._rotate()
+
+    def _rotate(self):
+        # in the asynchronous mode this waits for the pending records
+        self._writer.close()
+        self._open()
+
+    def _metadata(self, tag: str, metadata: bytes) -> bytes:
+        """Returns `metadata` only for the first event of `tag` in the current file: TensorBoard remembers it."""
+        if tag in self._tags_with_metadata:
+            return b''
+        self._tags_with_metadata.add(tag)
+        return metadata
 
     @staticmethod
-    def _make_log(tag, first_step, method):
+    def _make_log(tag, first_step, method, every: int = None, min_interval: float = None,
+                  log_scale: bool = False):
         step = first_step - 1
+        last_logged = None
 
         def wrapper(value):
-            nonlocal step
+            nonlocal step, last_logged
             step += 1
+            # the skipped steps cost nothing: the value is not even looked at
+            if every is not None and step % every:
+                return
+            if log_scale and not _is_log_scale_step(step):
+                return
+            if min_interval is not None:
+                now = monotonic()
+                if last_logged is not None and now - last_logged < min_interval:
+                    return
+                last_logged = now
+
+            if callable(value):
+                value = value()
             return method(tag, value, step)
 
         return wrapper
 
+    @property
+    def _image_converter(self) -> ImageConverter:
+        converter = getattr(self._local, 'image_converter', None)
+        if converter is None:
+            converter = self._local.image_converter = ImageConverter()
+        return converter
+
+    def flush(self):
+        """Waits until all the logged events are written to disk."""
+        with self._lock:
+            self._check_open()
+            self._write_pending_images(wait=True)
+            self._writer.flush()
+
     def close(self):
-        if self.file is not None:
-            self.file.close()
-            self.file = None
+        with self._lock:
+            if self._writer is not None:
+                try:
+                    self._write_pending_images(wait=True)
+                    if self.start_step is not None:
+                        self._write_to_file(encode_session_log_event(time(), 0, SessionLog.STOP))
+                finally:
+                    try:
+                        if self._image_executor is not None:
+                            self._image_executor.shutdown()
+                        self._writer.close()
+                    finally:
+                        # the logger is closed even if the file could not be
+                        self._writer = None
 
-    def make_log_scalar(self, tag: str, first_step: int = 0) -> callable(Union[int, float]):
+    def make_log_scalar(self, tag: str, first_step: int = 0, every: int = None, min_interval: float = None,
+                        log_scale: bool = False) -> callable(Union[int, float]):
         """
         Creates a shortcut callable, that writes to a tag and increments the step.
 
+        The steps can be skipped by the conditions below, all of which must hold for a step to be logged.
+        The skipped steps are free. The value can also be a callable without arguments,
+        which is called only if the step is logged.
+
         Parameters
         ----------
         tag: str
         first_step: int, optional
+        every: int, optional
+            log only the steps that are multiples of `every`.
+        min_interval: float, optional
+            log at most once per this many seconds.
+        log_scale: bool, optional
+            log only the steps 0, ..., 9, 10, 20, ..., 90, 100, 200, ...
         """
-        return self._make_log(tag, first_step, self.log_scalar)
+        return self._make_log(tag, first_step, self.log_scalar, every, min_interval, log_scale)
 
-    def make_log_image(self, tag: str, first_step: int = 0) -> callable(np.array):
+    def make_log_image(self, tag: str, first_step: int = 0, every: int = None, min_interval: float = None,
+                       log_scale: bool = False) -> callable(np.array):
         """Analog to `make_log_scalar`"""
-        return self._make_log(tag, first_step, self.log_image)
+        return self._make_log(tag, first_step, self.log_image, every, min_interval, log_scale)
 
-    def make_log_text(self, tag: str, first_step: int = 0) -> callable(Union[str, Iterable]):
+    def make_log_audio(self, tag: str, sample_rate: int, first_step: int = 0, every: int = None,
+                       min_interval: float = None, log_scale: bool = False) -> callable(np.array):
         """Analog to `make_log_scalar`"""
-        return self._make_log(tag, first_step, self.log_text)
+        def method(tag, waveform, step):
+            return self.log_audio(tag, waveform, sample_rate, step)
 
-    def make_log_histogram(self, tag: str, first_step: int = 0, num_bars: int = 30) \
-            -> callable(np.array):
+        return self._make_log(tag, first_step, method, every, min_interval, log_scale)
+
+    def make_log_text(self, tag: str, first_step: int = 0, every: int = None, min_interval: float = None,
+                      log_scale: bool = False) -> callable(Union[str, Iterable]):
+        """Analog to `make_log_scalar`"""
+        return self._make_log(tag, first_step, self.log_text, every, min_interval, log_scale)
+
+    def make_log_histogram(self, tag: str, first_step: int = 0, num_bars: int = 30,
+                           layout: str = 'linear', sample_size: int = None, sampling: str = 'random',
+                           seed: int = 0, exact_stats: bool = True, every: int = None,
+                           min_interval: float = None, log_scale: bool = False) -> callable(np.array):
         """Analog to `make_log_scalar`"""
-        method = functools.partial(self.log_histogram, num_bars=num_bars)
-        return self._make_log(tag, first_step, method)
+        method = functools.partial(self.log_histogram, num_bars=num_bars, layout=layout,
+                                   sample_size=sample_size, sampling=sampling, seed=seed,
+                                   exact_stats=exact_stats)
+        return self._make_log(tag, first_step, method, every, min_interval, log_scale)
 
     def log_scalar(self, tag: str, value: Union[int, float], step: int):
         """
@@ -100,9 +297,39 @@ class Logger:
         step: int
         """
         value = float(value)
-        self._write_event(tag, step, simple_value=value)
+        self._write_record(encode_scalar_event(time(), step, self.tag_prefix + tag, value))
+
+    def log_scalars(self, values: Dict[str, Union[int, float]], step: int):
+        """
+        Adds several scalars to log as a single event.
+
+        Parameters
+        ----------
+        values: dict
+            mapping from tags to values.
+        step: int
+        """
+        self.log_scalars_from_arrays(list(values.keys()), list(values.values()), step)
+
+    def log_scalars_from_arrays(self, tags: Sequence[str], values: np.array, step: int):
+        """
+        Adds several scalars to log as a single event.
+
+        Parameters
+        ----------
+        tags: sequence of str
+        values: np.array
+            1D array of values, one for each tag.
+        step: int
+        """
+        values = np.asarray(values, dtype=float)
+        if values.shape != (len(tags),):
+            raise ValueError('Expected %d values, got an array of shape %s' % (len(tags), values.shape))
+
+        tags = [self.tag_prefix + tag for tag in tags]
+        self._write_record(encode_scalars_event(time(), step, tags, values.tolist()))
 
-    def log_image(self, tag: str, image: np.array, step: int):
+    def log_image(self, tag: str, image: np.array, step: int, image_format: str = None):
         """
         Adds an image to log.
 
@@ -112,63 +339,160 @@ class Logger:
         image: np.array
             Image of shape 3xMxN (RGB), 4xMxN (RGBA), MxN or 1xMxN (grayScale)
         step: int
+        image_format: str, optional
+            'bmp', 'png' or 'jpeg'. By default the logger's `image_format` is used.
         """
-        assert image.ndim in [2, 3]
+        tag = self.tag_prefix + tag
+        image = to_pil(image, self._image_converter, tag)
+        image_format = image_format or self.image_format
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError('Unknown image format: %r' % image_format)
 
-        if image.ndim == 3:
-            mode = len(image)
-            if mode == 1:
-                image = image[0]
-            else:
-                image = np.transpose(image, (1, 2, 0))
+        if self._image_executor is None:
+            self._write_record(self._encode_image_event(time(), step, [tag], [image], image_format))
         else:
-            mode = 1
+            # the image might share memory with the array
+            self._submit_images(time(), step, [tag], [image.copy()], image_format)
 
-        try:
-            image = Image.fromarray(image, COLOR_SPACES[mode])
-        except KeyError:
-            raise TypeError('Cannot convert tensor of shape %s '
-                            'to image' % image.shape) from None
+    def log_images(self, tag: str, batch: np.array, step: int, grid: bool = True, columns: int = None,
+                   padding: int = 2, normalize: bool = False, image_format: str = None):
+        """
+        Adds a batch of images to log as a single event.
 
-        # convert to bytes
-        with BytesIO() as output:
-            image.save(output, 'BMP')
-            image_string = output.getvalue()
+        Parameters
+        ----------
+        tag: str
+        batch: np.array
+            Images of shape NxCxHxW or NxHxW. See `log_image` for the supported channels.
+        step: int
+        grid: bool, optional
+            whether to tile the images into a single one. Otherwise each image is stored as
+            a separate value with tag "<tag>/image/<index>".
+        columns: int, optional
+            the number of images in a grid row. By default the grid is close to a square.
+        padding: int, optional
+            the distance between neighbouring images in the grid.
+        normalize: bool, optional
+            whether to scale each image to the range 0-255 independently.
+        image_format: str, optional
+            'bmp', 'png' or 'jpeg'. By default the logger's `image_format` is used.
+        """
+        if grid:
+            image = make_grid(batch, columns, padding, normalize=normalize)
+            return self.log_image(tag, image, step, image_format)
 
-        img = Summary.Image(height=image.height, width=image.width, colorspace=mode,
-                            encoded_image_string=image_string)
-        self._write_event(tag, step, image=img)
+        batch = np.asarray(batch)
+        if normalize:
+            batch = normalize_batch(batch)
+        image_format = image_format or self.image_format
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError('Unknown image format: %r' % image_format)
 
-    def log_histogram(self, tag: str, data: np.array, step: int, num_bars: int = 30):
+        tags = ['%s%s/image/%d' % (self.tag_prefix, tag, i) for i in range(len(batch))]
+        images = [to_pil(image, self._image_converter, tag) for tag, image in zip(tags, batch)]
+        if self._image_executor is None:
+            self._write_record(self._encode_image_event(time(), step, tags, images, image_format))
+        else:
+            self._submit_images(time(), step, tags, [image.copy() for image in images], image_format)
+
+    def _encode_image_event(self, wall_time, step, tags, images, image_format):
+        values = []
+        for tag, image in zip(tags, images):
+            encoded = encode_image(image, image_format, self.png_compression, self.jpeg_quality)
+            colorspace = 3 if image_format == 'jpeg' and image.mode == 'RGBA' else len(image.getbands())
+            values.append(encode_image_value(tag, image.height, image.width, colorspace, encoded))
+        return encode_event(wall_time, step, values)
+
+    def _submit_images(self, wall_time, step, tags, images, image_format):
+        with self._lock:
+            self._check_open()
+            self._pending_images.append(self._image_executor.submit(
+                self._encode_image_event, wall_time, step, tags, images, image_format))
+            self._write_pending_images()
+
+    def _write_pending_images(self, wait: bool = False):
+        """Writes the encoded images in the order they were logged."""
+        with self._lock:
+            pending = self._pending_images
+            while pending and (wait or pending[0].done() or len(pending) > self._max_pending_images):
+                self._write_record(pending.popleft().result())
+
+    def log_histogram(self, tag: str, data: Union[np.array, HistogramAccumulator], step: int,
+                      num_bars: int = 30, layout: str = 'linear', sample_size: int = None,
+                      sampling: str = 'random', seed: int = 0, exact_stats: bool = True):
         """
         Adds a histogram to log.
 
         Parameters
         ----------
         tag: str
-        data: np.array
-            Array of any shape.
+        data: np.array, HistogramAccumulator
+            Array of any shape, or a histogram accumulated from chunks of data.
         step: int
         num_bars: int
-            The number of bars if the resulting histogram.
-        """
-        data = data.ravel()
-        min_ = data.min()
-        max_ = data.max()
-        sum_ = data.sum()
-        sum_sq = data.dot(data)
-        if min_ == max_:
-            num = 1
-            bucket_limit = [min_]
-            bucket = [len(data)]
+            The number of bars if the resulting histogram for the linear layout.
+        layout: str
+            'linear' - `num_bars` equal bars spanning the range of `data`,
+            'exponential' - Tensorflow's fixed exponential buckets, which are stable between steps.
+        sample_size: int
+            If `data` is larger, the bars are approximated from a sample of this size.
+        sampling: str
+            How to sample the data: 'random' or 'strided'.
+        seed: int
+            The seed for random sampling.
+        exact_stats: bool
+            Whether to compute min, max and sums over the whole data when sampling.
+
+        All the arguments except `tag` and `step` are ignored for `HistogramAccumulator`.
+        """
+        if isinstance(data, HistogramAccumulator):
+            hist = data.result()
         else:
-            bucket, bucket_limit = np.histogram(data, num_bars)
-            num = len(bucket_limit)
-            bucket_limit = bucket_limit[1:]
+            hist = compute_histogram(data, num_bars, layout, sample_size, sampling, seed, exact_stats)
 
-        hist = HistogramProto(min=min_, max=max_, sum=sum_, sum_squares=sum_sq, num=num,
-                              bucket_limit=bucket_limit, bucket=bucket)
-        self._write_event(tag, step, histo=hist)
+        value = encode_histogram_value(self.tag_prefix + tag, *hist)
+        self._write_record(encode_event(time(), step, [value]))
+
+    def log_audio(self, tag: str, waveform: np.array, sample_rate: int, step: int):
+        """
+        Adds an audio clip to log. It is stored as 16-bit WAV.
+
+        Parameters
+        ----------
+        tag: str
+        waveform: np.array
+            Samples of shape N (mono) or CxN (C channels). Floating point samples must be in [-1, 1],
+            integer samples are full-scale PCM of their bit depth, e.g. int32.
+        sample_rate: int
+            In Hz.
+        step: int
+        """
+        samples = to_pcm16(waveform)
+        encoded = encode_wav(samples, sample_rate)
+        frames, channels = samples.shape
+        self._write_record(encode_event(time(), step, [
+            encode_audio_value(self.tag_prefix + tag, sample_rate, channels, frames, encoded)]))
+
+    def log_tensor(self, tag: str, array: np.array, step: int):
+        """
+        Adds a numeric tensor to log. The values are stored as raw bytes in `TensorProto.tensor_content`.
+
+        Parameters
+        ----------
+        tag: str
+        array: np.array
+            Array of any shape. Supported dtypes: float16/32/64, int8/16/32/64, uint8/16, complex64/128, bool.
+        step: int
+        """
+        array = np.asarray(array)
+        dtype = array.dtype.newbyteorder('=')
+        if dtype not in TENSOR_TYPES:
+            raise TypeError('Cannot log tensor of type %s' % array.dtype)
+
+        # no copy for C-contiguous little-endian arrays
+        array = np.asarray(array, dtype.newbyteorder('<'), order='C')
+        self._write_record(encode_tensor_event(time(), step, self.tag_prefix + tag, TENSOR_TYPES[dtype],
+                                               array.shape, array))
 
     def log_text(self, tag: str, tensor: Union[str, Iterable], step: int):
         """
@@ -181,14 +505,10 @@ class Logger:
             String, or iterable of type str and dimensionality <= 2
         step: int
         """
+        tag = self.tag_prefix + tag
         tensor = np.asarray(tensor, dtype=bytes)
-
-        shape = TensorShapeProto()
-        for i in tensor.shape:
-            shape.dim.add(size=i)
-        tensor_ = TensorProto(dtype=tensor_type.DT_STRING, tensor_shape=shape,
-                              string_val=tensor.ravel(), version_number=1)
-        # TODO: no need to save metadata on each step
-        metadata = SummaryMetadata()
-        metadata.plugin_data.add(plugin_name='text', content='{}')
-        self._write_event(tag, step, tensor=tensor_, metadata=metadata)
+        # the metadata must go to the file that was current when it was requested
+        with self._lock:
+            metadata = self._metadata(tag, TEXT_METADATA)
+            value = encode_text_value(tag, tensor.ravel().tolist(), tensor.shape, metadata)
+            self._write_record(encode_event(time(), step, [value]))
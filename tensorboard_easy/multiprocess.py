@@ -0,0 +1,167 @@
+"""
+Logging from several processes to a single events file.
+
+The worker processes encode the events and send the records over a queue
+to a server process, which owns the file.
+"""
+import multiprocessing
+from collections import namedtuple
+from time import monotonic
+
+from .logger import Logger
+
+# the options of `Logger` that apply to the workers, the others belong to the server
+_WORKER_OPTIONS = ('image_format', 'png_compression', 'jpeg_quality', 'image_workers')
+WorkerStats = namedtuple('WorkerStats', ['records', 'bytes', 'records_per_second', 'bytes_per_second'])
+
+
+def _serve(queue, path, options, counters):
+    with Logger(path, **options) as logger:
+        while True:
+            item = queue.get()
+            try:
+                if item is None:
+                    return
+                rank, record = item
+                if record is None:
+                    logger.flush()
+                else:
+                    logger._write_record(record)
+                    counters[2 * rank] += 1
+                    counters[2 * rank + 1] += len(record)
+            finally:
+                queue.task_done()
+
+
+class _QueueWriter:
+    """Sends the records to the server instead of writing them to a file."""
+
+    def __init__(self, queue, rank: int):
+        self.queue = queue
+        self.rank = rank
+
+    def write(self, record: bytes):
+        self.queue.put((self.rank, record))
+
+    def flush(self):
+        # the server flushes the file once it gets to this message
+        self.queue.put((self.rank, None))
+        self.queue.join()
+
+    def close(self):
+        self.flush()
+
+
+class _WorkerLogger(Logger):
+    def __init__(self, path, writer: _QueueWriter, **kwargs):
+        self._queue_writer = writer
+        super().__init__(path, **kwargs)
+
+    def _open(self):
+        # the file, its header and the rotation belong to the server
+        self.filename = None
+        self._writer = self._queue_writer
+        self._file_bytes = 0
+        self._file_opened = monotonic()
+        self._tags_with_metadata = set()
+
+
+class LogServer:
+    """
+    Starts a process that writes the events of several worker processes to a single file inside `path`.
+
+    The server must be created in the main process and passed to the workers,
+    each of which calls `logger` to get its `Logger`.
+
+    Parameters
+    ----------
+    path: str
+        the logs folder.
+    num_workers: int
+        the number of worker processes. Their ranks are 0, ..., num_workers - 1.
+    max_queue: int, optional
+        the maximal number of records waiting to be written. The workers block when the queue is full.
+    flush_events: int, optional
+    flush_bytes: int, optional
+    flush_secs: float, optional
+        the flush policy of the file, see `Logger`.
+
+    Examples
+    --------
+    >>> server = LogServer('logs', num_workers=4)
+    >>> # in the worker
+    >>> with server.logger(rank) as log:
+    ...     log.log_scalar('loss', loss, step)  # the tag is "rank<rank>/loss"
+    >>> # in the main process, after the workers are done
+    >>> server.close()
+    """
+
+    def __init__(self, path, num_workers: int, max_queue: int = 1024, flush_events: int = 1,
+                 flush_bytes: int = None, flush_secs: float = None):
+        context = multiprocessing.get_context()
+        self.path = path
+        self.num_workers = num_workers
+        self._queue = context.JoinableQueue(max_queue)
+        # the number of records and bytes received from each worker
+        self._counters = context.RawArray('q', 2 * num_workers)
+        self._started = monotonic()
+
+        options = dict(flush_events=flush_events, flush_bytes=flush_bytes, flush_secs=flush_secs)
+        self._process = context.Process(target=_serve, args=(self._queue, path, options, self._counters),
+                                        name='LogServer', daemon=True)
+        self._process.start()
+
+    def __getstate__(self):
+        # the process can only be managed from the main process
+        state = self.__dict__.copy()
+        state['_process'] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def logger(self, rank: int, tag_prefix: str = None, **kwargs) -> Logger:
+        """
+        Creates a logger that sends the events to the server. Must be called inside the worker process.
+
+        Parameters
+        ----------
+        rank: int
+            the worker's rank.
+        tag_prefix: str, optional
+            prepended to all the tags. By default equals to "rank<rank>/".
+        kwargs
+            the image encoding options of `Logger`: image_format, png_compression, jpeg_quality
+            and image_workers.
+        """
+        unknown = sorted(set(kwargs) - set(_WORKER_OPTIONS))
+        if unknown:
+            raise TypeError('Unsupported worker options: %s' % ', '.join(unknown))
+        if not 0 <= rank < self.num_workers:
+            raise ValueError('The rank must be in [0, %d), got %d' % (self.num_workers, rank))
+        if tag_prefix is None:
+            tag_prefix = 'rank%d/' % rank
+        return _WorkerLogger(self.path, _QueueWriter(self._queue, rank), tag_prefix=tag_prefix, **kwargs)
+
+    def stats(self) -> dict:
+        """Returns the number of records and bytes received from each worker, and their throughput."""
+        elapsed = max(monotonic() - self._started, 1e-9)
+        counters = self._counters[:]
+        return {rank: WorkerStats(counters[2 * rank], counters[2 * rank + 1],
+                                  counters[2 * rank] / elapsed, counters[2 * rank + 1] / elapsed)
+                for rank in range(self.num_workers)}
+
+    def flush(self):
+        """Waits until all the records sent so far are written to disk."""
+        _QueueWriter(self._queue, 0).flush()
+
+    def close(self):
+        """Writes the remaining records and stops the server. Must be called after the workers are done."""
+        if self._process is None:
+            raise ValueError('The server can only be closed by the process that started it')
+        if self._process.is_alive():
+            self._queue.put(None)
+            self._process.join()
@@ -0,0 +1,646 @@
+import mmap
+import os
+import struct
+import tempfile
+import traceback
+from collections import namedtuple
+from typing import Iterator, Union, Sequence, Dict
+
+import numpy as np
+
+from .proto.event_pb2 import Event
+from .utils import encode
+from .wire import decode_event_header, decode_scalars, encode_scalars_event
+
+_header = struct.Struct('<QI')
+_length = struct.Struct('<Q')
+_footer = struct.Struct('<I')
+
+
+def read_records(path: str, verify: bool = True, buffer_size: int = 1 << 20) -> Iterator[bytes]:
+    """
+    Iterates over the serialized events stored in a file.
+
+    An incomplete record at the end of the file (e.g. one that is being written right now) is ignored.
+
+    Parameters
+    ----------
+    path: str
+    verify: bool, optional
+        whether to check the CRCs of the records. A `ValueError` is raised on mismatch.
+    buffer_size: int, optional
+        the size of the chunks read from the disk.
+    """
+    with open(path, 'rb', buffering=buffer_size) as file:
+        while True:
+            header = file.read(_header.size)
+            if len(header) < _header.size:
+                return
+
+            length, length_crc = _header.unpack(header)
+            if verify and encode(header[:8]) != length_crc:
+                raise ValueError('Corrupted record length at offset %d' % (file.tell() - len(header)))
+
+            data = file.read(length)
+            footer = file.read(_footer.size)
+            if len(footer) < _footer.size:
+                return
+            if verify and encode(data) != _footer.unpack(footer)[0]:
+                raise ValueError('Corrupted record data at offset %d' %
+                                 (file.tell() - length - _footer.size))
+
+            yield data
+
+
+def read_events(path: str, verify: bool = True, buffer_size: int = 1 << 20) -> Iterator[Event]:
+    """
+    Iterates over the events stored in a file. Each event is decoded only when it is requested.
+
+    Parameters
+    ----------
+    path: str
+    verify: bool, optional
+        whether to check the CRCs of the records. A `ValueError` is raised on mismatch.
+    buffer_size: int, optional
+        the size of the chunks read from the disk.
+    """
+    for record in read_records(path, verify, buffer_size):
+        yield Event.FromString(record)
+
+
+def _iterate_buffer(buffer, verify: bool):
+    """Yields the offsets and the contents of the records stored in `buffer`."""
+    view = memoryview(buffer)
+    offset, size = 0, len(view)
+    while offset + _header.size <= size:
+        length, length_crc = _header.unpack_from(view, offset)
+        if verify and encode(view[offset:offset + 8]) != length_crc:
+            raise ValueError('Corrupted record length at offset %d' % offset)
+
+        start = offset + _header.size
+        stop = start + length
+        if stop + _footer.size > size:
+            return
+        data = view[start:stop]
+        if verify and encode(data) != _footer.unpack_from(view, stop)[0]:
+            raise ValueError('Corrupted record data at offset %d' % start)
+
+        yield offset, data
+        offset = stop + _footer.size
+
+
+def default_index_path(path: str) -> str:
+    # the index must not match the "tfevents" pattern, otherwise tensorboard would try to load it
+    folder, name = os.path.split(path)
+    return os.path.join(folder, '.%s.index.npz' % name.replace('tfevents', 'tfindex'))
+
+
+class EventIndex:
+    """
+    Random access to the summaries of an events file by tag and step.
+
+    The file is memory-mapped and indexed in a single pass. The index is stored in a sidecar file
+    and reused as long as the size and modification time of the events file don't change.
+
+    Parameters
+    ----------
+    path: str
+    index_path: str, optional
+        where to store the index. By default it is stored next to the events file.
+        Pass False to disable the cache.
+    verify: bool, optional
+        whether to check the CRCs of the records while building the index.
+    """
+    _FIELDS = ('tags', 'tag_ids', 'steps', 'wall_times', 'offsets')
+
+    def __init__(self, path: str, index_path: str = None, verify: bool = True):
+        self.path = path
+        if index_path is None:
+            index_path = default_index_path(path)
+        self.index_path = index_path
+
+        with open(path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            self._key = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+            # empty files can't be mapped
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+
+        if not self._load():
+            self._build(verify)
+            self._save()
+
+        # the first and last entry of each tag in the sorted index
+        self._bounds = np.searchsorted(self._tag_ids, np.arange(len(self._tags) + 1))
+        self._tag_to_id = {tag: i for i, tag in enumerate(self._tags.tolist())}
+
+    def _load(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with np.load(self.index_path) as index:
+                if not np.array_equal(index['key'], self._key):
+                    return False
+                self._tags, self._tag_ids, self._steps, self._wall_times, self._offsets = \
+                    [index[field] for field in self._FIELDS]
+        except Exception:
+            # a truncated or otherwise broken index is rebuilt
+            return False
+        return True
+
+    def _save(self):
+        if not self.index_path:
+            return
+        # the index is written to a temporary file first, so that a partial index is never loaded
+        folder, name = os.path.split(self.index_path)
+        try:
+            file = tempfile.NamedTemporaryFile(dir=folder or '.', prefix=name, suffix='.tmp', delete=False)
+        except OSError:
+            # the index is only a cache
+            return
+        try:
+            with file:
+                np.savez(file, key=self._key, tags=self._tags, tag_ids=self._tag_ids, steps=self._steps,
+                         wall_times=self._wall_times, offsets=self._offsets)
+            os.replace(file.name, self.index_path)
+        except OSError:
+            os.remove(file.name)
+
+    def _build(self, verify):
+        tag_to_id = {}
+        tag_ids, steps, wall_times, offsets = [], [], [], []
+        for offset, record in _iterate_buffer(self._buffer, verify):
+            wall_time, step, tags = decode_event_header(record)
+            for tag in tags:
+                tag_ids.append(tag_to_id.setdefault(tag, len(tag_to_id)))
+                steps.append(step)
+                wall_times.append(wall_time)
+                offsets.append(offset)
+
+        tags = np.array(sorted(tag_to_id), dtype=str)
+        # renumber the tags in sorted order
+        mapping = np.zeros(len(tags), dtype=np.int32)
+        mapping[[tag_to_id[tag] for tag in tags.tolist()]] = np.arange(len(tags))
+
+        tag_ids = mapping[np.array(tag_ids, dtype=np.int64)]
+        steps = np.array(steps, dtype=np.int64)
+        order = np.lexsort((steps, tag_ids))
+
+        self._tags = tags
+        self._tag_ids = tag_ids[order]
+        self._steps = steps[order]
+        self._wall_times = np.array(wall_times, dtype=np.float64)[order]
+        self._offsets = np.array(offsets, dtype=np.int64)[order]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+
+    @property
+    def tags(self):
+        return self._tags.tolist()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _range(self, tag, start, stop):
+        tag_id = self._tag_to_id.get(tag)
+        if tag_id is None:
+            return 0, 0
+
+        first, last = self._bounds[tag_id], self._bounds[tag_id + 1]
+        steps = self._steps[first:last]
+        if start is not None:
+            first += np.searchsorted(steps, start)
+        if stop is not None:
+            last -= len(steps) - np.searchsorted(steps, stop)
+        return first, last
+
+    def steps(self, tag: str, start: int = None, stop: int = None) -> np.ndarray:
+        """The steps of `tag` in the range [start, stop)."""
+        first, last = self._range(tag, start, stop)
+        return self._steps[first:last]
+
+    def wall_times(self, tag: str, start: int = None, stop: int = None) -> np.ndarray:
+        """The wall times of `tag` in the step range [start, stop)."""
+        first, last = self._range(tag, start, stop)
+        return self._wall_times[first:last]
+
+    def events(self, tag: str, start: int = None, stop: int = None) -> Iterator[Event]:
+        """
+        Iterates over the events that contain `tag` in the step range [start, stop), ordered by step.
+        Only these events are decoded.
+        """
+        first, last = self._range(tag, start, stop)
+        for offset in self._offsets[first:last].tolist():
+            length = _header.unpack_from(self._buffer, offset)[0]
+            offset += _header.size
+            yield Event.FromString(self._buffer[offset:offset + length])
+
+    def values(self, tag: str, start: int = None, stop: int = None):
+        """Iterates over pairs (step, `Summary.Value`) for `tag` in the step range [start, stop)."""
+        for event in self.events(tag, start, stop):
+            for value in event.summary.value:
+                if value.tag == tag:
+                    yield event.step, value
+
+
+Scalars = namedtuple('Scalars', ['steps', 'wall_times', 'values'])
+
+
+def find_event_files(path: str) -> list:
+    """Returns the events files in the folder `path`, or `path` itself, if it is a file."""
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if 'tfevents' in name)
+
+
+def _find_period(lengths: list):
+    """The smallest period with which `lengths` repeat, if they contain at least two periods."""
+    for period in range(1, len(lengths) // 2 + 1):
+        if lengths[period:] == lengths[:-period]:
+            return period
+
+
+def _walk_records(buffer) -> np.ndarray:
+    """
+    The offsets of the complete records in `buffer`.
+
+    Each offset is known only after the previous record's length is read, so the records are walked in Python.
+    But usually the lengths repeat with a short period, e.g. the same tags are logged at each step.
+    In this case the offsets of the next records are predicted by repeating the last period, and numpy checks
+    thousands of predictions at once: the predictions are correct up to the first record, whose actual length
+    differs from the predicted one.
+    """
+    size = len(buffer)
+    lengths_at = np.ndarray(max(0, size - 7), '<u8', buffer, strides=(1,))
+    unpack = _length.unpack_from
+    chunks, offsets, recent = [], [], []
+    offset, batch = 0, 256
+    while True:
+        # a few steps in Python
+        for _ in range(64):
+            if offset + _header.size > size:
+                break
+            stop = offset + _header.size + unpack(buffer, offset)[0] + _footer.size
+            if stop > size:
+                break
+            offsets.append(offset)
+            recent.append(stop - offset)
+            offset = stop
+        else:
+            recent = recent[-64:]
+            period = _find_period(recent)
+            while period is not None:
+                # the predicted sizes of the next records and their offsets
+                sizes = np.tile(np.array(recent[-period:], np.int64), batch // period)
+                predicted = offset + np.cumsum(sizes) - sizes
+                predicted = predicted[predicted + _header.size <= size]
+                actual = lengths_at[predicted].astype(np.int64) + _header.size + _footer.size
+                wrong = np.flatnonzero(actual != sizes[:len(predicted)])
+                # the first wrong prediction is still a correct offset
+                count = wrong[0] + 1 if len(wrong) else len(predicted)
+                predicted, actual = predicted[:count], actual[:count]
+                count = np.count_nonzero(predicted + actual <= size)
+                if count == 0:
+                    break
+
+                chunks.append(np.array(offsets, np.int64))
+                chunks.append(predicted[:count])
+                offsets = []
+                recent = actual[max(0, count - 64):count].tolist()
+                offset = int(predicted[count - 1] + actual[count - 1])
+                if count < len(sizes):
+                    batch = 256
+                    break
+                batch = min(2 * batch, 1 << 16)
+            continue
+
+        chunks.append(np.array(offsets, np.int64))
+        return np.concatenate(chunks)
+
+
+def _record_bounds(buffer, verify: bool):
+    """The start and stop offsets of the records' data."""
+    if verify:
+        offsets = np.array([offset for offset, _ in _iterate_buffer(buffer, verify)], np.int64)
+    else:
+        offsets = _walk_records(buffer)
+
+    lengths = np.ndarray(max(0, len(buffer) - 7), '<u8', buffer, strides=(1,))[offsets].astype(np.int64)
+    starts = offsets + _header.size
+    return starts, starts + lengths
+
+
+def _gather(data: np.ndarray, offsets: np.ndarray, size: int) -> np.ndarray:
+    """The `size` bytes starting at each offset, as rows of a matrix. The bytes must be inside `data`."""
+    rows = np.ndarray((max(0, len(data) - size + 1), size), np.uint8, data, strides=(1, 1))
+    return rows[offsets]
+
+
+def _read_varints(data: np.ndarray, offsets: np.ndarray):
+    """
+    Decodes the varints of up to 8 bytes starting at each offset.
+    Returns the values and the offsets after the varints, which are -1 for the longer varints
+    and for the varints that start less than 8 bytes before the end of `data`.
+    """
+    # most varints, e.g. the lengths of small messages, take a single byte
+    if len(offsets) and offsets.max() < len(data):
+        values = data[offsets]
+        if values.max() < 0x80:
+            return values.astype(np.int64), offsets + 1
+
+    inside = offsets <= len(data) - 8
+    words = np.ndarray(max(0, len(data) - 7), '<u8', data, strides=(1,))[np.where(inside, offsets, 0)]
+    # the high bit of the last byte
+    last = ~words & np.uint64(0x8080808080808080)
+    last &= -last
+    sizes = np.where((last != 0) & inside, (np.log2(np.maximum(last, 1)).astype(np.int64) + 1) // 8, -1)
+    words &= last - np.uint64(1)
+    values, scratch = np.zeros(len(offsets), np.uint64), np.empty(len(offsets), np.uint64)
+    for i in range(sizes.max(initial=0)):
+        np.right_shift(words, np.uint64(i), out=scratch)
+        scratch &= np.uint64(0x7f << 7 * i)
+        values |= scratch
+    return values.view(np.int64), np.where(sizes > 0, offsets + sizes, -1)
+
+
+def _stable_argsort(keys: np.ndarray) -> np.ndarray:
+    # a stable sort of small non-negative integers is a radix sort
+    if len(keys):
+        keys = keys.astype(np.min_scalar_type(keys.max()))
+    return np.argsort(keys, kind='stable')
+
+
+def _find_values(data: np.ndarray, starts: np.ndarray, stops: np.ndarray):
+    """
+    Parses the summaries, which contain only values that end with a float, e.g. the scalars.
+
+    Parameters
+    ----------
+    data: np.ndarray
+    starts, stops: np.ndarray
+        the bounds of the summaries' content.
+
+    Returns
+    -------
+    valid: np.ndarray
+        whether each summary has the expected layout.
+    summaries, indices, floats: np.ndarray
+        for each value: the index of its summary, its index in the summary and the offset of its float.
+    """
+    valid = np.ones(len(starts), bool)
+    summaries, indices, floats = [], [], []
+    active, position, index = np.flatnonzero(starts < stops), starts[starts < stops], 0
+    while len(active):
+        length, start = _read_varints(data, position + 1)
+        end = start + length
+        correct = (data[position] == 0x0a) & (start > 0) & (length >= 5) & (end <= stops[active])
+        correct[correct] = data[end[correct] - 5] == 0x15
+        if not correct.all():
+            valid[active[~correct]] = False
+            active, end = active[correct], end[correct]
+
+        summaries.append(active)
+        indices.append(np.full(len(active), index, np.int64))
+        floats.append(end - 4)
+
+        remaining = end < stops[active]
+        active, position, index = active[remaining], end[remaining], index + 1
+
+    summaries, indices, floats = [np.concatenate(column + [np.zeros(0, np.int64)])
+                                  for column in [summaries, indices, floats]]
+    if not valid.all():
+        keep = valid[summaries]
+        summaries, indices, floats = summaries[keep], indices[keep], floats[keep]
+    return valid, summaries, indices, floats
+
+
+class _ScalarsBuffer:
+    """Preallocated columns that grow geometrically."""
+    _COLUMNS = (('records', np.int64), ('indices', np.int64), ('tag_ids', np.int64), ('steps', np.int64),
+                ('wall_times', np.float64), ('values', np.float32))
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        for name, dtype in self._COLUMNS:
+            setattr(self, name, np.empty(capacity, dtype))
+
+    def append(self, record, index, tag_id, step, wall_time, value):
+        if self.size == len(self.steps):
+            capacity = 2 * self.size
+            for name, _ in self._COLUMNS:
+                setattr(self, name, np.resize(getattr(self, name), capacity))
+
+        size = self.size
+        self.records[size] = record
+        self.indices[size] = index
+        self.tag_ids[size] = tag_id
+        self.steps[size] = step
+        self.wall_times[size] = wall_time
+        self.values[size] = value
+        self.size += 1
+
+    def columns(self):
+        return [getattr(self, name)[:self.size] for name, _ in self._COLUMNS]
+
+
+def _scan_scalars(buffer, tags, verify: bool):
+    """
+    Extracts the scalars from a buffer of records.
+
+    Most of the scalars are written by `log_scalar` or `log_scalars`: an event with the wall time, the step
+    and a summary of simple values. Such events with the same tags differ only in these fields,
+    so the rest of the event's bytes identify its tags. The layout of the summaries is parsed by numpy
+    for all the events at once, and only one event per distinct set of tags is decoded.
+    The other events are decoded one by one by `decode_scalars`.
+
+    Returns
+    -------
+    tag_names: list
+    tag_ids, steps, wall_times, values: np.ndarray
+        the columns of the scalars, sorted by tag and then in file order.
+    """
+    tag_names, tag_to_id = [], {}
+
+    def get_tag_id(tag):
+        # -1 for the tags that are not requested
+        if tag not in tag_to_id:
+            tag_to_id[tag] = len(tag_names) if tags is None or tag in tags else -1
+            if tag_to_id[tag] >= 0:
+                tag_names.append(tag)
+        return tag_to_id[tag]
+
+    starts, stops = _record_bounds(buffer, verify)
+    data = np.frombuffer(buffer, np.uint8)
+
+    # the layout of `encode_scalars_event`: the wall time, the step (omitted if 0) and the summary
+    records = np.flatnonzero((stops - starts >= 18) & (starts + 18 <= len(data)) & (data[starts] == 0x09) &
+                             (data[stops - 5] == 0x15))
+    first, last = (starts, stops) if len(records) == len(starts) else (starts[records], stops[records])
+    has_step = data[first + 9] == 0x10
+    steps, positions = _read_varints(data, first + 10)
+    steps[~has_step] = 0
+    positions[~has_step] = first[~has_step] + 9
+    valid = (positions > first) & (positions < last - 4)
+    positions[~valid] = first[~valid]
+    valid &= data[positions] == 0x2a
+    # the checks of the layout only help to find the floats: the other bytes of the events are compared
+    # with an event that is decoded and encoded back
+    _, content = _read_varints(data, positions + 1)
+    valid &= (content > 0) & (content < last)
+    content[~valid] = first[~valid]
+    length, start = _read_varints(data, content + 1)
+    # `log_scalar` writes a single value that spans the summary
+    single = valid & (data[content] == 0x0a) & (start > 0) & (start + length == last)
+    multiple = np.flatnonzero(valid & ~single)
+    parsed, summaries, indices, floats = _find_values(data, content[multiple], last[multiple])
+    valid[multiple] = parsed
+    single = np.flatnonzero(single)
+    summaries = np.concatenate([single, multiple[summaries]])
+    indices = np.concatenate([np.zeros(len(single), np.int64), indices])
+    floats = np.concatenate([last[single] - 4, floats])
+
+    # the events are grouped by their bytes between the step and the last float, with the other floats zeroed
+    templates = np.full(len(records), -1, np.int64)
+    template_tags = []
+    lengths = last - 4 - positions
+    candidates = np.flatnonzero(valid)
+    candidates = candidates[_stable_argsort(lengths[candidates])]
+    inner = np.flatnonzero(floats < last[summaries] - 4)
+    inner = inner[_stable_argsort(lengths[summaries[inner]])]
+    record_bounds = np.flatnonzero(np.diff(lengths[candidates], prepend=-1))
+    unique_lengths = lengths[candidates[record_bounds]]
+    inner_bounds = np.searchsorted(lengths[summaries[inner]], unique_lengths)
+    row_of = np.zeros(len(records), np.int64)
+    record_bounds, inner_bounds = np.append(record_bounds, len(candidates)), np.append(inner_bounds, len(inner))
+    for number, length in enumerate(unique_lengths.tolist()):
+        group = candidates[record_bounds[number]:record_bounds[number + 1]]
+        rows = np.zeros((len(group), -(-length // 8) * 8), np.uint8)
+        rows[:, :length] = _gather(data, positions[group], length)
+        group_inner = inner[inner_bounds[number]:inner_bounds[number + 1]]
+        if len(group_inner):
+            row_of[group] = np.arange(len(group))
+            value_records = summaries[group_inner]
+            row, column = row_of[value_records], floats[group_inner] - positions[value_records]
+            for shift in range(4):
+                rows[row, column + shift] = 0
+
+        rows = rows.view(np.uint64)
+        hashes = np.zeros(len(group), np.uint64)
+        for column in rows.T:
+            hashes = (hashes ^ column) * np.uint64(1099511628211)
+        _, representatives, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        template_ids = np.full(len(representatives), -1, np.int64)
+        for i, record in enumerate(group[representatives].tolist()):
+            record = buffer[first[record]:last[record]]
+            wall_time, step, scalars = decode_scalars(record)
+            if scalars and encode_scalars_event(wall_time, step, *zip(*scalars)) == record:
+                template_ids[i] = len(template_tags)
+                template_tags.append([get_tag_id(tag) for tag, _ in scalars])
+
+        # the events with colliding hashes are decoded
+        same = (rows == rows[representatives][inverse]).all(1)
+        templates[group[same]] = template_ids[inverse[same]]
+
+    # the tags of each value, the last -1 stands for the events without a template
+    offsets = np.cumsum([0] + [len(tag_ids) for tag_ids in template_tags])
+    template_tags = np.array([tag_id for tag_ids in template_tags for tag_id in tag_ids] + [-1], np.int64)
+    value_templates = templates[summaries]
+    tag_ids = template_tags.take(offsets[value_templates] + indices, mode='clip')
+    keep = (value_templates >= 0) & (tag_ids >= 0)
+    if not keep.all():
+        summaries, indices, floats, tag_ids = summaries[keep], indices[keep], floats[keep], tag_ids[keep]
+    columns = [
+        [records[summaries]], [indices], [tag_ids], [steps[summaries]],
+        [np.ndarray(max(0, len(data) - 7), '<f8', data, strides=(1,))[first[summaries] + 1]],
+        [np.ndarray(max(0, len(data) - 3), '<f4', data, strides=(1,))[floats]],
+    ]
+    del data
+
+    decoded = _ScalarsBuffer()
+    others = np.ones(len(starts), bool)
+    others[records[templates >= 0]] = False
+    others = np.flatnonzero(others)
+    for record, start, stop in zip(others.tolist(), starts[others].tolist(), stops[others].tolist()):
+        wall_time, step, scalars = decode_scalars(buffer[start:stop])
+        for index, (tag, value) in enumerate(scalars):
+            tag_id = get_tag_id(tag)
+            if tag_id >= 0:
+                decoded.append(record, index, tag_id, step, wall_time, value)
+
+    records, indices, tag_ids, steps, wall_times, values = [
+        np.concatenate(column + [part]) for column, part in zip(columns, decoded.columns())]
+    # restore the file order, and then group by tag
+    order = np.argsort(records * (indices.max(initial=0) + 1) + indices, kind='stable')
+    order = order[_stable_argsort(tag_ids[order])]
+    return tag_names, tag_ids[order], steps[order], wall_times[order], values[order]
+
+
+def _read_file_scalars(path, tags, verify):
+    with open(path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            return {}
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        tag_names, tag_ids, steps, wall_times, values = _scan_scalars(buffer, tags, verify)
+    except BaseException as error:
+        # the frames of the traceback hold views of the map, which can't be closed while they exist
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        buffer.close()
+
+    bounds = np.searchsorted(tag_ids, np.arange(len(tag_names) + 1))
+    return {tag: Scalars(steps[first:last], wall_times[first:last], values[first:last])
+            for tag, first, last in zip(tag_names, bounds[:-1], bounds[1:])}
+
+
+def read_scalars(paths: Union[str, Sequence[str]], tags: Sequence[str] = None, verify: bool = False,
+                 as_frame: bool = False) -> Dict[str, Scalars]:
+    """
+    Loads the scalars from events files into contiguous arrays.
+
+    Parameters
+    ----------
+    paths: str, sequence of str
+        events files or folders containing them. The files are read in the given order.
+    tags: sequence of str, optional
+        the tags to load. By default all the scalars are loaded.
+    verify: bool, optional
+        whether to check the CRCs of the records.
+    as_frame: bool, optional
+        whether to return pandas DataFrames with columns "step", "wall_time" and "value".
+        Requires pandas to be installed.
+
+    Returns
+    -------
+    scalars: dict
+        mapping from tags to `Scalars` (steps, wall_times, values) or DataFrames.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    if tags is not None:
+        tags = set(tags)
+
+    parts = {}
+    for path in paths:
+        for file in find_event_files(path):
+            for tag, scalars in _read_file_scalars(file, tags, verify).items():
+                parts.setdefault(tag, []).append(scalars)
+
+    result = {tag: Scalars(*map(np.concatenate, zip(*scalars))) for tag, scalars in parts.items()}
+    if as_frame:
+        import pandas as pd
+
+        result = {tag: pd.DataFrame({'step': scalars.steps, 'wall_time': scalars.wall_times,
+                                     'value': scalars.values}) for tag, scalars in result.items()}
+    return result
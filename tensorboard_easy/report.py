@@ -0,0 +1,163 @@
+"""
+Reduces the scalars of many runs to a summary table.
+
+Usage: python -m tensorboard_easy.report ROOT [--tags TAG [TAG ...]] [--mode {min,max}]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence, Dict
+
+import numpy as np
+
+from .reader import read_scalars
+
+# the per-file statistics of a tag, which can be merged across files
+COUNT, TOTAL, MINIMUM, MAXIMUM, FINAL_STEP, FINAL_WALL_TIME, FINAL_VALUE = range(7)
+
+
+def find_runs(root: str) -> Dict[str, list]:
+    """Returns a mapping from the folders inside `root` that contain events files to the files' paths."""
+    runs = {}
+    for folder, _, names in os.walk(root):
+        files = sorted(os.path.join(folder, name) for name in names if 'tfevents' in name)
+        if files:
+            runs[os.path.relpath(folder, root)] = files
+    return runs
+
+
+def summarize_file(path: str) -> dict:
+    """Computes the mergeable statistics of each scalar tag in an events file."""
+    stats = {}
+    for tag, scalars in read_scalars(path).items():
+        values = scalars.values.astype(np.float64)
+        last = np.lexsort((scalars.wall_times, scalars.steps))[-1]
+        stats[tag] = [len(values), float(values.sum()), float(values.min()), float(values.max()),
+                      int(scalars.steps[last]), float(scalars.wall_times[last]), float(values[last])]
+    return stats
+
+
+def _merge(first, second):
+    final = max(first, second, key=lambda x: (x[FINAL_STEP], x[FINAL_WALL_TIME]))
+    return [first[COUNT] + second[COUNT], first[TOTAL] + second[TOTAL],
+            min(first[MINIMUM], second[MINIMUM]), max(first[MAXIMUM], second[MAXIMUM])] + \
+        final[FINAL_STEP:]
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_cache(path):
+    if path is None or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    if path is None:
+        return
+    try:
+        with open(path, 'w') as file:
+            json.dump(cache, file)
+    except OSError:
+        pass
+
+
+def summarize_runs(root: str, tags: Sequence[str] = None, mode: str = 'min', processes: int = None,
+                   cache_path: str = None) -> Dict[str, Dict[str, dict]]:
+    """
+    Reduces the scalars of all the runs inside `root`.
+
+    Parameters
+    ----------
+    root: str
+    tags: sequence of str, optional
+        the tags to summarize. By default all the scalars are summarized.
+    mode: str, optional
+        whether the best value is the 'min' or the 'max'.
+    processes: int, optional
+        the number of processes used to parse the files. By default equals to the number of CPUs.
+    cache_path: str, optional
+        a json file with the statistics of already parsed files. Only the files whose size or modification
+        time changed since the previous call are parsed again.
+
+    Returns
+    -------
+    summary: dict
+        run -> tag -> dict with keys 'final', 'best', 'mean', 'count', 'final_step'.
+    """
+    if mode not in ['min', 'max']:
+        raise ValueError('Unknown mode: %r' % mode)
+
+    runs = find_runs(root)
+    cache = _load_cache(cache_path)
+    keys = {path: _file_key(path) for files in runs.values() for path in files}
+    stale = [path for path, key in keys.items() if path not in cache or cache[path]['key'] != key]
+
+    if stale:
+        if processes == 1:
+            stats = list(map(summarize_file, stale))
+        else:
+            with ProcessPoolExecutor(processes) as executor:
+                stats = list(executor.map(summarize_file, stale, chunksize=max(1, len(stale) // 64)))
+        cache.update({path: {'key': keys[path], 'stats': value} for path, value in zip(stale, stats)})
+
+    # drop the files that no longer exist
+    cache = {path: cache[path] for path in keys}
+    _save_cache(cache_path, cache)
+
+    summary = {}
+    for run, files in runs.items():
+        merged = {}
+        for path in files:
+            for tag, stats in cache[path]['stats'].items():
+                if tags is None or tag in tags:
+                    merged[tag] = _merge(merged[tag], stats) if tag in merged else stats
+
+        summary[run] = {tag: {
+            'final': stats[FINAL_VALUE],
+            'best': stats[MINIMUM] if mode == 'min' else stats[MAXIMUM],
+            'mean': stats[TOTAL] / stats[COUNT],
+            'count': stats[COUNT],
+            'final_step': stats[FINAL_STEP],
+        } for tag, stats in merged.items()}
+
+    return summary
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description='Summarize the scalars of all the runs inside a folder.')
+    parser.add_argument('root')
+    parser.add_argument('--tags', nargs='+', help='the tags to summarize, all by default')
+    parser.add_argument('--mode', choices=['min', 'max'], default='min', help='which value is the best')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--cache', default=None,
+                        help='the cache file, by default ROOT/.tensorboard_easy_report.json')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = args.cache or os.path.join(args.root, '.tensorboard_easy_report.json')
+
+    summary = summarize_runs(args.root, args.tags, args.mode, args.processes, cache)
+
+    columns = ['final', 'best', 'mean', 'count', 'final_step']
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['run', 'tag'] + columns)
+    for run in sorted(summary):
+        for tag in sorted(summary[run]):
+            writer.writerow([run, tag] + [summary[run][tag][column] for column in columns])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import asyncio
+import shutil
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from tensorboard_easy.aio import AsyncLogger
+from tensorboard_easy.reader import read_events, read_scalars
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def test_logging(self):
+        async def log_task(log, task):
+            log_loss = log.make_log_scalar('loss/%d' % task)
+            for step in range(50):
+                await log_loss(step)
+                await log.log_scalars({'a/%d' % task: step, 'b/%d' % task: -step}, step)
+                if step % 10 == 0:
+                    await log.log_image('image/%d' % task, np.random.rand(3, 16, 16), step)
+                    await log.log_histogram('histogram/%d' % task, np.random.normal(size=100), step,
+                                            layout='exponential')
+                    await log.log_text('text/%d' % task, 'step %d' % step, step)
+
+        async def main():
+            executor = ThreadPoolExecutor(4)
+            async with AsyncLogger('log_path/aio', executor, image_format='png') as log:
+                await asyncio.gather(*[log_task(log, task) for task in range(8)])
+                await log.flush()
+                # the events are on disk
+                self.assertEqual(len(read_scalars(log.filename)), 8 * 3)
+            executor.shutdown()
+            return log.filename
+
+        shutil.rmtree('log_path/aio', ignore_errors=True)
+        filename = asyncio.run(main())
+
+        scalars = read_scalars(filename)
+        for task in range(8):
+            np.testing.assert_array_equal(scalars['loss/%d' % task].values, np.arange(50))
+            np.testing.assert_array_equal(np.sort(scalars['b/%d' % task].steps), np.arange(50))
+
+        tags = [event.summary.value[0].tag for event in read_events(filename) if event.HasField('summary')]
+        self.assertEqual(sum(tag.startswith('image/') for tag in tags), 8 * 5)
+        self.assertEqual(sum(tag.startswith('histogram/') for tag in tags), 8 * 5)
+
+    def test_schedule(self):
+        async def main():
+            async with AsyncLogger('log_path/aio_schedule') as log:
+                log_loss = log.make_log_scalar('loss', every=5)
+                log_hist = log.make_log_histogram('histogram', log_scale=True, layout='exponential')
+                log_audio = log.make_log_audio('audio', 8000, first_step=1, every=10)
+                for step in range(30):
+                    await log_loss(step)
+                    await log_hist(np.random.normal(size=10))
+                    await log_audio(np.random.uniform(-1, 1, 100))
+            return log.filename
+
+        shutil.rmtree('log_path/aio_schedule', ignore_errors=True)
+        filename = asyncio.run(main())
+        np.testing.assert_array_equal(read_scalars(filename)['loss'].steps, [0, 5, 10, 15, 20, 25])
+        steps = [event.step for event in read_events(filename)
+                 if event.HasField('summary') and event.summary.value[0].tag == 'histogram']
+        self.assertEqual(steps, list(range(10)) + [10, 20])
+        audio = [(event.step, event.summary.value[0].audio.sample_rate) for event in read_events(filename)
+                 if event.HasField('summary') and event.summary.value[0].tag == 'audio']
+        self.assertEqual(audio, [(10, 8000), (20, 8000), (30, 8000)])
@@ -0,0 +1,64 @@
+import unittest
+import wave
+from io import BytesIO
+
+import numpy as np
+
+from tensorboard_easy import Logger
+from tensorboard_easy.audio import to_pcm16
+from tensorboard_easy.reader import read_events
+
+
+def decode(audio):
+    with wave.open(BytesIO(audio.encoded_audio_string)) as file:
+        channels = file.getnchannels()
+        samples = np.frombuffer(file.readframes(file.getnframes()), '<i2')
+        return file.getframerate(), samples.reshape(-1, channels).T
+
+
+class TestAudio(unittest.TestCase):
+    def test_pcm(self):
+        np.testing.assert_array_equal(to_pcm16(np.array([-2, -1, -.5, 0, .5, 1, 2])).ravel(),
+                                      [-32767, -32767, -16384, 0, 16384, 32767, 32767])
+        np.testing.assert_array_equal(to_pcm16(np.array([0, 128, 255], np.uint8)).ravel(), [-32768, 0, 32512])
+        np.testing.assert_array_equal(to_pcm16(np.array([-2 ** 31, -65536, 5, 2 ** 31 - 1], np.int32)).ravel(),
+                                      [-32768, -1, 0, 32767])
+        np.testing.assert_array_equal(to_pcm16(np.array([-128, -1, 0, 127], np.int8)).ravel(),
+                                      [-32768, -256, 0, 32512])
+        np.testing.assert_array_equal(to_pcm16(np.array([-2 ** 63, 2 ** 62], np.int64)).ravel(),
+                                      [-32768, 16384])
+        np.testing.assert_array_equal(to_pcm16(np.array([0, 32768, 65535], np.uint16)).ravel(),
+                                      [-32768, 0, 32767])
+        np.testing.assert_array_equal(to_pcm16(np.array([0, 2 ** 31, 2 ** 32 - 1], np.uint32)).ravel(),
+                                      [-32768, 0, 32767])
+        self.assertEqual(to_pcm16(np.zeros((2, 10), np.int16)).shape, (10, 2))
+        with self.assertRaises(ValueError):
+            to_pcm16(np.zeros((1, 2, 3)))
+        with self.assertRaises(TypeError):
+            to_pcm16(np.array(['a', 'b']))
+
+    def test_log_audio(self):
+        mono = np.sin(np.linspace(0, 100, 16000)).astype(np.float32)
+        stereo = np.random.randint(-1000, 1000, (2, 8000)).astype(np.int16)
+        with Logger('log_path') as log:
+            log.log_audio('mono', mono, 16000, 1)
+            log_stereo = log.make_log_audio('stereo', 8000, first_step=10)
+            log_stereo(stereo)
+            log_stereo(stereo)
+            filename = log.filename
+
+        values = [(event.step, event.summary.value[0]) for event in read_events(filename)
+                  if event.HasField('summary')]
+        self.assertEqual([(step, value.tag) for step, value in values],
+                         [(1, 'mono'), (10, 'stereo'), (11, 'stereo')])
+
+        audio = values[0][1].audio
+        self.assertEqual((audio.sample_rate, audio.num_channels, audio.length_frames), (16000, 1, 16000))
+        self.assertEqual(audio.content_type, 'audio/wav')
+        rate, samples = decode(audio)
+        self.assertEqual(rate, 16000)
+        np.testing.assert_array_equal(samples[0], np.rint(mono.astype(np.float64) * 32767))
+
+        audio = values[1][1].audio
+        self.assertEqual((audio.num_channels, audio.length_frames), (2, 8000))
+        np.testing.assert_array_equal(decode(audio)[1], stereo)
@@ -0,0 +1,159 @@
+import unittest
+
+import numpy as np
+
+from tensorboard_easy import Logger, HistogramAccumulator
+from tensorboard_easy.histogram import compute_histogram, compact_buckets, exponential_bucket_limits
+
+
+class TestAccumulator(unittest.TestCase):
+    def check(self, accumulator, data):
+        hist = accumulator.result()
+        data = np.concatenate([np.ravel(x) for x in data]).astype(float)
+        self.assertEqual(hist.num, data.size)
+        self.assertEqual(hist.min, data.min())
+        self.assertEqual(hist.max, data.max())
+        np.testing.assert_allclose(hist.sum, data.sum())
+        np.testing.assert_allclose(hist.sum_squares, data.dot(data))
+        self.assertLessEqual(len(hist.bucket), 2 * accumulator.num_bars)
+
+        # the counts are exact for the half-open buckets
+        edges = np.append(hist.bucket_limit[0] - accumulator.bucket_width, hist.bucket_limit)
+        counts = np.bincount(np.searchsorted(edges, data, side='right') - 1, minlength=len(hist.bucket))
+        np.testing.assert_array_equal(hist.bucket, counts)
+
+    def test_chunks(self):
+        np.random.seed(0)
+        data = [np.random.normal(0, 1, (100, 30)), np.random.normal(10, 5, 1000),
+                np.random.randint(-1000, 1000, (50, 50))[:, ::3], np.float32(3), [1e-3] * 10]
+        hist = HistogramAccumulator(chunk_size=100)
+        for i in range(len(data)):
+            hist.update(data[i])
+            self.check(hist, data[:i + 1])
+        result = hist.result()
+
+        # the same result regardless of chunking
+        other = HistogramAccumulator().update(*data).result()
+        np.testing.assert_array_equal(other.bucket, result.bucket)
+        np.testing.assert_array_equal(other.bucket_limit, result.bucket_limit)
+
+    def test_constant(self):
+        for value in [0, 1, -1e-5, 1e100]:
+            hist = HistogramAccumulator().update(np.full(100, value))
+            self.assertEqual(hist.result().bucket.tolist(), [100])
+            self.check(hist, [np.full(100, value)])
+
+        data = [np.zeros(10), np.full(10, -1e-10), np.full(10, 1e300)]
+        self.check(HistogramAccumulator().update(*data), data)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            HistogramAccumulator().result()
+        with self.assertRaises(ValueError):
+            HistogramAccumulator().update([1, np.nan])
+
+    def test_logger(self):
+        try:
+            with Logger('log_path') as log:
+                hist = HistogramAccumulator().update(*[np.random.rand(10, 10) for _ in range(10)])
+                log.log_histogram('accumulated', hist, 0)
+        except BaseException:
+            self.fail()
+
+
+class TestExponential(unittest.TestCase):
+    def test_limits(self):
+        limits = exponential_bucket_limits()
+        middle = len(limits) // 2
+        self.assertEqual(limits[middle], 0)
+        self.assertEqual(limits[middle + 1], 1e-12)
+        self.assertEqual(limits[-1], np.finfo(float).max)
+        self.assertTrue(np.all(np.diff(limits) > 0))
+        np.testing.assert_array_equal(limits, -limits[::-1])
+        self.assertIs(limits, exponential_bucket_limits())
+
+    def test_compact(self):
+        limits = np.arange(8.)
+        limits, counts = compact_buckets(limits, np.array([0, 0, 1, 0, 2, 3, 0, 0]))
+        self.assertEqual(limits.tolist(), [1, 2, 3, 4, 5, 7])
+        self.assertEqual(counts.tolist(), [0, 1, 0, 2, 3, 0])
+
+    def test_histogram(self):
+        data = np.random.normal(size=(100, 100))
+        hist = compute_histogram(data, layout='exponential')
+        self.assertEqual(hist.num, data.size)
+        self.assertEqual(hist.bucket.sum(), data.size)
+
+        limits = exponential_bucket_limits()
+        counts = np.array([((data >= lo) & (data < hi)).sum() for lo, hi in zip(limits[:-1], limits[1:])])
+        nonzero = hist.bucket > 0
+        np.testing.assert_array_equal(hist.bucket[nonzero], counts[counts > 0])
+        np.testing.assert_array_equal(hist.bucket_limit[nonzero], limits[1:][counts > 0])
+
+        accumulated = HistogramAccumulator(layout='exponential', chunk_size=333).update(data).result()
+        np.testing.assert_array_equal(accumulated.bucket, hist.bucket)
+        np.testing.assert_array_equal(accumulated.bucket_limit, hist.bucket_limit)
+
+        with self.assertRaises(ValueError):
+            compute_histogram(data, layout='unknown')
+        for layout in ['linear', 'exponential']:
+            with self.assertRaises(ValueError):
+                compute_histogram(np.zeros((0, 3)), layout=layout)
+
+    def test_logger(self):
+        try:
+            with Logger('log_path') as log:
+                for i in range(10):
+                    log.log_histogram('exponential', np.random.normal(0, i + 1, 500), i, layout='exponential')
+                write = log.make_log_histogram('shortcut', layout='exponential')
+                write(np.zeros(10))
+        except BaseException:
+            self.fail()
+
+
+class TestSampling(unittest.TestCase):
+    def test_error_bound(self):
+        data = np.random.RandomState(1).normal(size=(1000, 1000))
+        exact = compute_histogram(data)
+        size = 10000
+        # DKW inequality: the bound holds with probability > 1 - 2 * exp(-2 * size * bound ** 2)
+        bound = .03
+
+        for sampling in ['random', 'strided']:
+            for view in [data, data.T]:
+                hist = compute_histogram(view, sample_size=size, sampling=sampling)
+                self.assertEqual(hist.num, data.size)
+                self.assertEqual(hist.min, data.min())
+                self.assertEqual(hist.max, data.max())
+                np.testing.assert_allclose(hist.sum_squares, exact.sum_squares)
+                np.testing.assert_array_equal(hist.bucket_limit, exact.bucket_limit)
+                np.testing.assert_allclose(hist.bucket.sum(), data.size)
+
+                error = np.abs(np.cumsum(hist.bucket) - np.cumsum(exact.bucket)) / data.size
+                self.assertLess(error.max(), bound, sampling)
+
+        hist = compute_histogram(data, sample_size=size, layout='exponential', exact_stats=False)
+        self.assertLessEqual(hist.max, data.max())
+        self.assertLess(abs(hist.sum_squares / data.size - 1), bound)
+
+    def test_deterministic(self):
+        data = np.random.normal(size=100000)
+        first = compute_histogram(data, sample_size=1000, seed=5)
+        second = compute_histogram(data, sample_size=1000, seed=5)
+        np.testing.assert_array_equal(first.bucket, second.bucket)
+
+        small = compute_histogram(data[:100], sample_size=1000)
+        np.testing.assert_array_equal(small.bucket, compute_histogram(data[:100]).bucket)
+
+        with self.assertRaises(ValueError):
+            compute_histogram(data, sample_size=10, sampling='unknown')
+
+    def test_logger(self):
+        try:
+            with Logger('log_path') as log:
+                log.log_histogram('sampled', np.random.rand(1000, 1000), 0, sample_size=1000)
+                write = log.make_log_histogram('sampled', layout='exponential', sample_size=100,
+                                               sampling='strided', exact_stats=False)
+                write(np.random.rand(1000, 1000))
+        except BaseException:
+            self.fail()
@@ -0,0 +1,158 @@
+import unittest
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from tensorboard_easy import Logger
+from tensorboard_easy.image import make_grid, to_pil, to_uint8, ImageConverter
+from tensorboard_easy.reader import read_events
+
+
+def decode(value):
+    return np.asarray(Image.open(BytesIO(value.image.encoded_image_string)))
+
+
+class TestImage(unittest.TestCase):
+    def test_formats(self):
+        image = np.random.randint(0, 256, (3, 64, 64), dtype=np.uint8)
+        with Logger('log_path', image_format='png', png_compression=9) as log:
+            log.log_image('png', image, 0)
+            log.log_image('bmp', image, 0, image_format='bmp')
+            log.log_image('jpeg', image, 0, image_format='jpeg')
+            log.log_image('rgba', np.random.randint(0, 256, (4, 10, 10), dtype=np.uint8), 0,
+                          image_format='jpeg')
+            with self.assertRaises(ValueError):
+                log.log_image('unknown', image, 0, image_format='gif')
+            filename = log.filename
+
+        values = {event.summary.value[0].tag: event.summary.value[0]
+                  for event in read_events(filename) if event.HasField('summary')}
+        np.testing.assert_array_equal(decode(values['png']), image.transpose(1, 2, 0))
+        np.testing.assert_array_equal(decode(values['bmp']), image.transpose(1, 2, 0))
+        self.assertEqual(decode(values['jpeg']).shape, (64, 64, 3))
+        self.assertEqual(values['rgba'].image.colorspace, 3)
+        self.assertEqual((values['png'].image.height, values['png'].image.width), (64, 64))
+
+        with self.assertRaises(ValueError):
+            Logger('log_path', image_format='gif')
+
+    def test_workers(self):
+        images = [np.random.randint(0, 256, (1, 32, 32), dtype=np.uint8) for _ in range(50)]
+        with Logger('log_path', image_format='png', image_workers=4) as log:
+            for i, image in enumerate(images):
+                log.log_image('image', image, i)
+                log.log_scalar('scalar', i, i)
+                # the logger must not depend on the array after the call
+                image[:] = 0
+            filename = log.filename
+
+        events = [event for event in read_events(filename)
+                  if event.HasField('summary') and event.summary.value[0].tag == 'image']
+        self.assertEqual([event.step for event in events], list(range(50)))
+        for event in events:
+            self.assertGreater(decode(event.summary.value[0]).max(), 0)
+
+    def test_grid(self):
+        batch = np.arange(5 * 3 * 4 * 6, dtype=np.uint8).reshape(5, 3, 4, 6)
+        grid = make_grid(batch, padding=1, pad_value=255)
+        self.assertEqual(grid.shape, (3, 2 * 5 - 1, 3 * 7 - 1))
+        np.testing.assert_array_equal(grid[:, :4, :6], batch[0])
+        np.testing.assert_array_equal(grid[:, :4, 14:], batch[2])
+        np.testing.assert_array_equal(grid[:, 5:, 7:13], batch[4])
+        self.assertTrue(np.all(grid[:, 4] == 255))
+        self.assertTrue(np.all(grid[:, 5:, 14:] == 255))
+
+        grid = make_grid(np.random.rand(4, 10, 10) * 100, columns=4, padding=0, normalize=True)
+        self.assertEqual(grid.shape, (1, 10, 40))
+        self.assertEqual(grid.dtype, np.uint8)
+        for i in range(4):
+            self.assertEqual(grid[..., i * 10:(i + 1) * 10].min(), 0)
+            self.assertEqual(grid[..., i * 10:(i + 1) * 10].max(), 255)
+
+        grid = make_grid(np.array([[[0, 3]], [[10, 8]]], np.uint8), padding=0, normalize=True)
+        np.testing.assert_array_equal(grid, [[[0, 255, 255, 0]]])
+        grid = make_grid(np.array([[[False, True]], [[True, True]]]), padding=0, normalize=True)
+        np.testing.assert_array_equal(grid, [[[0, 255, 255, 255]]])
+
+        with self.assertRaises(ValueError):
+            make_grid(np.zeros((10, 10)))
+
+    def test_log_images(self):
+        batch = np.random.randint(0, 256, (6, 3, 8, 8), dtype=np.uint8)
+        with Logger('log_path', image_format='png') as log:
+            log.log_images('grid', batch, 0)
+            log.log_images('separate', batch, 0, grid=False)
+            log.log_images('normalized', np.random.rand(6, 8, 8), 0, grid=False, normalize=True)
+            filename = log.filename
+
+        events = [event for event in read_events(filename) if event.HasField('summary')]
+        self.assertEqual(len(events), 3)
+        self.assertEqual(decode(events[0].summary.value[0]).shape, (18, 28, 3))
+
+        values = events[1].summary.value
+        self.assertEqual([value.tag for value in values], ['separate/image/%d' % i for i in range(6)])
+        for value, image in zip(values, batch):
+            np.testing.assert_array_equal(decode(value), image.transpose(1, 2, 0))
+        self.assertEqual(len(events[2].summary.value), 6)
+
+
+def reference(image):
+    """A straightforward conversion of a CxHxW image to HxWxC uint8."""
+    image = np.moveaxis(image, 0, -1)
+    if image.dtype == np.uint8:
+        return image
+    if image.dtype == bool:
+        return image.astype(np.uint8) * 255
+    if image.dtype == np.uint16:
+        return (image // 256).astype(np.uint8)
+
+    image = image.astype(np.float64)
+    if image.min() < 0 or image.max() > 1:
+        image = (image - image.min()) / (image.max() - image.min())
+    return np.floor(image * 255 + .5).astype(np.uint8)
+
+
+class TestConversion(unittest.TestCase):
+    def test_reference(self):
+        images = [
+            np.random.rand(3, 20, 30),
+            np.random.rand(4, 20, 30).astype(np.float32),
+            np.random.normal(0, 10, (3, 20, 30)),
+            np.random.randint(0, 65536, (3, 20, 30)).astype(np.uint16),
+            np.random.rand(3, 20, 30) > .5,
+            np.random.randint(0, 256, (3, 20, 30)).astype(np.uint8),
+            np.random.randint(-1000, 1000, (3, 20, 30)),
+            np.random.rand(30, 3, 20).transpose(1, 2, 0),
+        ]
+        converter = ImageConverter()
+        for image in images:
+            expected = reference(image)
+            np.testing.assert_array_equal(np.asarray(to_pil(image)), expected)
+            # the buffers are reused across calls
+            for _ in range(2):
+                np.testing.assert_array_equal(np.asarray(to_pil(image, converter, 'key')), expected)
+
+        np.testing.assert_array_equal(to_uint8(np.array([[0, 1, 255]])), [[0, 1, 255]])
+        np.testing.assert_array_equal(to_uint8(np.array([[.5, .5]])), [[128, 128]])
+        np.testing.assert_array_equal(to_uint8(np.full((2, 2), 7.)), np.zeros((2, 2)))
+        with self.assertRaises(TypeError):
+            to_pil(np.full((10, 10), 'text'))
+
+    def test_buffers(self):
+        converter = ImageConverter()
+        first = converter(np.random.rand(10, 10, 3), 'tag')
+        second = converter(np.random.rand(10, 10, 3), 'tag')
+        self.assertIs(first, second)
+        self.assertIsNot(converter(np.random.rand(10, 10, 3), 'other'), first)
+        self.assertEqual(converter(np.random.rand(5, 5), 'tag').shape, (5, 5))
+
+        converter = ImageConverter(max_buffers=2)
+        first = converter(np.random.rand(5, 5), 0)
+        converter(np.random.rand(5, 5), 1)
+        self.assertIs(converter(np.random.rand(5, 5), 0), first)
+        # the least recently used key is evicted
+        for key in range(2, 100):
+            converter(np.random.rand(5, 5), key)
+        self.assertEqual(list(converter._buffers), [98, 99])
+        self.assertIsNot(converter(np.random.rand(5, 5), 0), first)
@@ -1,10 +1,19 @@
+import os
+import shutil
 import unittest
+from collections import Counter
 from math import sin
+from threading import Thread
 from time import sleep
+from unittest import mock
 
 import numpy as np
 
 from tensorboard_easy import Logger
+from tensorboard_easy.logger import TENSOR_TYPES
+from tensorboard_easy.proto.event_pb2 import Event, SessionLog
+from tensorboard_easy.reader import read_records, read_events, find_event_files, read_scalars
+from tensorboard_easy.wire import iterate_fields
 
 
 class TestLogger(unittest.TestCase):
@@ -17,6 +26,19 @@ class TestLogger(unittest.TestCase):
         except BaseException:
             self.fail()
 
+    def test_scalars(self):
+        try:
+            with Logger('log_path') as log:
+                for i in range(100):
+                    log.log_scalars({'test_scalars/%d' % j: sin(i / 10) * j for j in range(200)}, i)
+                    log.log_scalars_from_arrays(['a', 'b', 'c'], np.random.rand(3), i)
+        except BaseException:
+            self.fail()
+
+        with Logger('log_path') as log:
+            with self.assertRaises(ValueError):
+                log.log_scalars_from_arrays(['a', 'b'], np.random.rand(3), 0)
+
     def test_image(self):
         try:
             with Logger('log_path') as log:
@@ -30,6 +52,19 @@ class TestLogger(unittest.TestCase):
             with self.assertRaises(TypeError):
                 log.log_image('test_img_ex', np.random.rand(5, 10, 10), 0)
 
+    def test_close_error(self):
+        log = Logger('log_path')
+        log.log_scalar('x', 1, 0)
+        writer = log._writer
+        with mock.patch.object(writer, 'close', side_effect=OSError):
+            with self.assertRaises(OSError):
+                log.close()
+        writer.close()
+        # the logger is closed anyway
+        with self.assertRaises(ValueError):
+            log.log_scalar('x', 1, 1)
+        log.close()
+
     def test_shortcut(self):
         try:
             with Logger('log_path') as log:
@@ -60,3 +95,184 @@ class TestLogger(unittest.TestCase):
                 log.log_text('2D', [['Some', 'multidimensional'], ['string', 'tensor']], 0)
         except BaseException:
             self.fail()
+
+    def test_numpy_steps(self):
+        with Logger('log_path') as log:
+            for step in [np.int32(5), np.int64(6)]:
+                log.log_scalar('scalar', 1., step)
+                log.log_scalars({'a': 1., 'b': 2.}, step)
+                log.log_histogram('histogram', np.random.rand(100), step)
+                log.log_image('image', np.random.rand(8, 8), step)
+                log.log_audio('audio', np.random.rand(100), 16000, step)
+                log.log_tensor('tensor', np.arange(3), step)
+                log.log_text('text', 'text', step)
+            log_scalar = log.make_log_scalar('shortcut', np.arange(10)[7])
+            log_scalar(1.)
+            filename = log.filename
+
+        steps = [event.step for event in read_events(filename) if event.HasField('summary')]
+        self.assertEqual(steps, [5] * 7 + [6] * 7 + [7])
+
+    def test_tensor(self):
+        arrays = [np.random.normal(size=(20, 30)).astype(dtype) for dtype in TENSOR_TYPES]
+        arrays += [np.arange(100).reshape(10, 10).T, np.arange(6, dtype='>f8'), np.float32(5)]
+        with Logger('log_path') as log:
+            for i, array in enumerate(arrays):
+                log.log_tensor('tensor', array, i)
+            with self.assertRaises(TypeError):
+                log.log_tensor('tensor', np.zeros(3, np.uint64), 0)
+            filename = log.filename
+
+        records = [record for record in read_records(filename) if Event.FromString(record).HasField('summary')]
+        self.assertEqual(len(records), len(arrays))
+        for array, record in zip(arrays, records):
+            tensor = Event.FromString(record).summary.value[0].tensor
+            self.assertEqual(tensor.dtype, TENSOR_TYPES[array.dtype.newbyteorder('=')])
+            self.assertEqual(tuple(dim.size for dim in tensor.tensor_shape.dim), np.shape(array))
+
+            fields = record
+            for number in [5, 1, 8, 4]:
+                fields = {field: value for field, _, value in iterate_fields(fields)}[number]
+            content = np.frombuffer(fields, array.dtype.newbyteorder('<')).reshape(np.shape(array))
+            np.testing.assert_array_equal(content, array)
+
+    def test_text_metadata(self):
+        with Logger('log_path') as log:
+            for i in range(3):
+                log.log_text('first', 'text %d' % i, i)
+                log.log_text('second', ['a', 'b'], i)
+            filename = log.filename
+
+        values = [event.summary.value[0] for event in read_events(filename) if event.HasField('summary')]
+        self.assertEqual([value.tag for value in values], ['first', 'second'] * 3)
+        self.assertEqual([value.HasField('metadata') for value in values], [True, True] + [False] * 4)
+        self.assertEqual(values[0].metadata.plugin_data[0].plugin_name, 'text')
+        self.assertEqual([value.tensor.string_val for value in values[::2]], [[b'text 0'], [b'text 1'], [b'text 2']])
+
+    def test_rotation(self):
+        for async_write in [False, True]:
+            shutil.rmtree('log_path/rotation', ignore_errors=True)
+            with Logger('log_path/rotation', max_bytes=1000, async_write=async_write) as log:
+                for i in range(100):
+                    log.log_scalar('scalar', i, i)
+                    log.log_text('text', 'step %d' % i, i)
+
+            files = find_event_files('log_path/rotation')
+            self.assertGreater(len(files), 5)
+            self.assertEqual(log.filename, files[-1])
+            for file in files[:-1]:
+                self.assertGreaterEqual(os.path.getsize(file), 1000)
+                self.assertLess(os.path.getsize(file), 1100)
+
+            scalars = read_scalars('log_path/rotation')['scalar']
+            np.testing.assert_array_equal(scalars.steps, np.arange(100))
+            for file in files:
+                values = [event.summary.value[0] for event in read_events(file) if event.HasField('summary')]
+                texts = [value for value in values if value.tag == 'text']
+                # each file has its own metadata
+                self.assertEqual([value.HasField('metadata') for value in texts],
+                                 [i == 0 for i in range(len(texts))])
+
+        shutil.rmtree('log_path/rotation', ignore_errors=True)
+        with Logger('log_path/rotation', max_age=.2) as log:
+            log.log_scalar('scalar', 0, 0)
+            sleep(.3)
+            log.log_scalar('scalar', 1, 1)
+            log.log_scalar('scalar', 2, 2)
+        self.assertEqual(len(find_event_files('log_path/rotation')), 2)
+
+    def test_header(self):
+        shutil.rmtree('log_path/header', ignore_errors=True)
+        with Logger('log_path/header', max_bytes=200, start_step=10) as log:
+            for i in range(10, 20):
+                log.log_scalar('scalar', i, i)
+
+        files = find_event_files('log_path/header')
+        self.assertGreater(len(files), 2)
+        for i, file in enumerate(files):
+            events = list(read_events(file))
+            self.assertEqual(events[0].file_version, 'brain.Event:2')
+            self.assertEqual(events[1].HasField('session_log'), i == 0)
+            self.assertEqual(events[-1].HasField('session_log'), i == len(files) - 1)
+
+        self.assertEqual(list(read_events(files[0]))[1].session_log.status, SessionLog.START)
+        self.assertEqual(list(read_events(files[0]))[1].step, 10)
+        self.assertEqual(list(read_events(files[-1]))[-1].session_log.status, SessionLog.STOP)
+        np.testing.assert_array_equal(read_scalars('log_path/header')['scalar'].steps, np.arange(10, 20))
+
+    def test_threads(self):
+        def work(log, thread):
+            for step in range(100):
+                log.log_scalar('scalar/%d' % thread, step, step)
+                log.log_text('text', 'thread %d' % thread, step)
+                if step % 10 == 0:
+                    log.log_histogram('histogram/%d' % thread, np.random.normal(size=1000), step)
+                    log.log_image('image', np.random.rand(3, 8, 8), step)
+
+        for options in [dict(), dict(async_write=True), dict(image_workers=2)]:
+            shutil.rmtree('log_path/threads', ignore_errors=True)
+            with Logger('log_path/threads', max_bytes=50000, **options) as log:
+                threads = [Thread(target=work, args=(log, i)) for i in range(16)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            files = find_event_files('log_path/threads')
+            self.assertGreater(len(files), 1)
+            tags = Counter()
+            for file in files:
+                # the CRCs are verified
+                events = [Event.FromString(record) for record in read_records(file, verify=True)]
+                self.assertEqual(events[0].file_version, 'brain.Event:2')
+                values = [event.summary.value[0] for event in events[1:]]
+                tags.update(value.tag.split('/')[0] for value in values)
+
+                texts = [value for value in values if value.tag == 'text']
+                self.assertEqual([value.HasField('metadata') for value in texts],
+                                 [i == 0 for i in range(len(texts))])
+
+            self.assertEqual(tags, {'scalar': 1600, 'text': 1600, 'histogram': 160, 'image': 160})
+            scalars = read_scalars('log_path/threads')
+            for i in range(16):
+                np.testing.assert_array_equal(np.sort(scalars['scalar/%d' % i].values), np.arange(100))
+
+    def test_schedule(self):
+        calls = []
+
+        def value(step):
+            def compute():
+                calls.append(step)
+                return step
+            return compute
+
+        shutil.rmtree('log_path/schedule', ignore_errors=True)
+        with Logger('log_path/schedule') as log:
+            every = log.make_log_scalar('every', every=3)
+            log_scale = log.make_log_scalar('log_scale', first_step=1, log_scale=True)
+            both = log.make_log_scalar('both', every=2, log_scale=True)
+            interval = log.make_log_scalar('interval', min_interval=.2)
+            histogram = log.make_log_histogram('histogram', every=10, num_bars=5)
+            for step in range(250):
+                every(value(step))
+                log_scale(step)
+                both(step)
+                histogram(np.random.normal(size=100))
+                if step in [0, 1, 2, 100]:
+                    interval(step)
+                if step == 2:
+                    sleep(.3)
+
+        scalars = read_scalars('log_path/schedule')
+        np.testing.assert_array_equal(scalars['every'].steps, np.arange(0, 250, 3))
+        # the skipped values are not computed
+        self.assertEqual(calls, list(range(0, 250, 3)))
+        decades = list(range(10, 100, 10)) + [100, 200]
+        np.testing.assert_array_equal(scalars['log_scale'].steps, list(range(1, 10)) + decades)
+        np.testing.assert_array_equal(scalars['both'].steps, [0, 2, 4, 6, 8] + decades)
+        # the shortcut counts its own steps: 1 and 2 come right after 0 and are skipped, 3 comes after the pause
+        np.testing.assert_array_equal(scalars['interval'].steps, [0, 3])
+
+        histograms = [event.step for event in read_events(log.filename)
+                      if event.HasField('summary') and event.summary.value[0].tag == 'histogram']
+        self.assertEqual(histograms, list(range(0, 250, 10)))
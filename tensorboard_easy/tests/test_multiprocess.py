@@ -0,0 +1,55 @@
+import multiprocessing
+import shutil
+import unittest
+
+import numpy as np
+
+from tensorboard_easy.multiprocess import LogServer
+from tensorboard_easy.reader import find_event_files, read_events, read_scalars
+
+
+def work(server, rank):
+    with server.logger(rank) as log:
+        for step in range(100):
+            log.log_scalar('loss', rank + step, step)
+        log.log_text('text', 'done', 100)
+        log.flush()
+
+
+class TestMultiprocess(unittest.TestCase):
+    def test_server(self):
+        shutil.rmtree('log_path/multiprocess', ignore_errors=True)
+        with LogServer('log_path/multiprocess', num_workers=4, max_queue=16) as server:
+            workers = [multiprocessing.Process(target=work, args=(server, rank)) for rank in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+                self.assertEqual(worker.exitcode, 0)
+
+            stats = server.stats()
+            self.assertEqual(sorted(stats), [0, 1, 2, 3])
+            for rank in range(4):
+                self.assertEqual(stats[rank].records, 101)
+                self.assertGreater(stats[rank].bytes, 0)
+                self.assertGreater(stats[rank].records_per_second, 0)
+
+        files = find_event_files('log_path/multiprocess')
+        self.assertEqual(len(files), 1)
+        scalars = read_scalars(files, verify=True)
+        self.assertEqual(sorted(scalars), ['rank%d/loss' % rank for rank in range(4)])
+        for rank in range(4):
+            np.testing.assert_array_equal(scalars['rank%d/loss' % rank].steps, np.arange(100))
+            np.testing.assert_array_equal(scalars['rank%d/loss' % rank].values, np.arange(100) + rank)
+
+        events = list(read_events(files[0]))
+        self.assertEqual(events[0].file_version, 'brain.Event:2')
+        texts = [event.summary.value[0] for event in events[1:] if event.summary.value[0].tag.endswith('text')]
+        self.assertEqual(len(texts), 4)
+        self.assertTrue(all(value.HasField('metadata') for value in texts))
+
+        with self.assertRaises(ValueError):
+            server.logger(4)
+        for options in [{'start_step': 0}, {'async_write': True}, {'max_bytes': 100}]:
+            with self.assertRaises(TypeError):
+                server.logger(0, **options)
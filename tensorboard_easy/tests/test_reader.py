@@ -0,0 +1,181 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from tensorboard_easy import Logger
+from tensorboard_easy.writer import EventFileWriter
+from tensorboard_easy.wire import encode_scalar_event, encode_scalars_event
+from tensorboard_easy.reader import read_events, read_records, read_scalars, EventIndex, \
+    default_index_path
+
+
+class TestReader(unittest.TestCase):
+    def test_read(self):
+        with Logger('log_path') as log:
+            for i in range(100):
+                log.log_scalar('scalar', i / 2, i)
+            log.log_histogram('histogram', np.random.rand(100), 0)
+            log.log_text('text', 'Some text', 0)
+            filename = log.filename
+
+        events = [event for event in read_events(filename, buffer_size=100)
+                  if event.HasField('summary')]
+        self.assertEqual(len(events), 102)
+        for i, event in enumerate(events[:100]):
+            self.assertEqual(event.step, i)
+            self.assertEqual(event.summary.value[0].tag, 'scalar')
+            self.assertEqual(event.summary.value[0].simple_value, i / 2)
+        self.assertTrue(events[100].summary.value[0].HasField('histo'))
+        self.assertEqual(events[101].summary.value[0].tensor.string_val, [b'Some text'])
+
+    def test_corrupted(self):
+        with Logger('log_path') as log:
+            for i in range(10):
+                log.log_scalar('scalar', i, i)
+            filename = log.filename
+
+        with open(filename, 'rb') as file:
+            data = bytearray(file.read())
+        size = len(list(read_records(filename)))
+
+        # incomplete records are skipped
+        with open(filename, 'wb') as file:
+            file.write(data[:-3])
+        self.assertEqual(len(list(read_records(filename))), size - 1)
+
+        data[-6] ^= 1
+        with open(filename, 'wb') as file:
+            file.write(data)
+        with self.assertRaises(ValueError):
+            list(read_records(filename))
+        self.assertEqual(len(list(read_records(filename, verify=False))), size)
+
+
+class TestIndex(unittest.TestCase):
+    def test_index(self):
+        with Logger('log_path') as log:
+            for i in range(100):
+                log.log_scalar('even' if i % 2 == 0 else 'odd', i, i)
+                log.log_scalars({'a': i, 'b': -i}, 1000 - i)
+            log.log_text('text', 'Some text', 0)
+            filename = log.filename
+
+        index_path = default_index_path(filename)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+        with EventIndex(filename) as index:
+            self.assertTrue(os.path.exists(index_path))
+            self.assertNotIn('tfevents', os.path.basename(index_path))
+            self.assertEqual(index.tags, ['a', 'b', 'even', 'odd', 'text'])
+            self.assertEqual(len(index), 301)
+
+            np.testing.assert_array_equal(index.steps('even'), np.arange(0, 100, 2))
+            np.testing.assert_array_equal(index.steps('a', 950, 960), np.arange(950, 960))
+            np.testing.assert_array_equal(index.steps('odd', 11, 20), [11, 13, 15, 17, 19])
+            self.assertEqual(len(index.steps('missing')), 0)
+
+            values = list(index.values('b', 990))
+            self.assertEqual([step for step, _ in values], list(range(990, 1001)))
+            self.assertEqual([value.simple_value for _, value in values], list(range(-10, 1)))
+            self.assertEqual(next(index.events('text')).summary.value[0].tensor.string_val,
+                             [b'Some text'])
+
+        # the cached index is reused
+        mtime = os.path.getmtime(index_path)
+        with EventIndex(filename) as index:
+            np.testing.assert_array_equal(index.steps('even'), np.arange(0, 100, 2))
+        self.assertEqual(os.path.getmtime(index_path), mtime)
+
+        with EventIndex(filename, index_path=False) as index:
+            self.assertEqual(len(index), 301)
+
+        # a broken index is rebuilt
+        with open(index_path, 'rb') as file:
+            data = file.read()
+        for broken in [data[:len(data) // 2], b'']:
+            with open(index_path, 'wb') as file:
+                file.write(broken)
+            with EventIndex(filename) as index:
+                self.assertEqual(len(index), 301)
+            with open(index_path, 'rb') as file:
+                self.assertEqual(file.read(), data)
+        self.assertEqual([name for name in os.listdir('log_path') if name.endswith('.tmp')], [])
+
+
+class TestReadScalars(unittest.TestCase):
+    def test_read_scalars(self):
+        shutil.rmtree('log_path/scalars', ignore_errors=True)
+        for offset in [0, 5000]:
+            with Logger('log_path/scalars') as log:
+                for i in range(offset, offset + 5000):
+                    log.log_scalar('x', i / 2, i)
+                    log.log_scalars({'y': i, 'z': -i}, i)
+                log.log_text('text', 'Some text', 0)
+
+        scalars = read_scalars('log_path/scalars')
+        self.assertEqual(set(scalars), {'x', 'y', 'z'})
+        np.testing.assert_array_equal(scalars['x'].steps, np.arange(10000))
+        np.testing.assert_array_equal(scalars['x'].values, np.arange(10000) / 2)
+        np.testing.assert_array_equal(scalars['z'].values, -np.arange(10000))
+        self.assertTrue(np.all(np.diff(scalars['y'].wall_times) >= 0))
+
+        scalars = read_scalars(['log_path/scalars'], tags=['y'], verify=True)
+        self.assertEqual(list(scalars), ['y'])
+        self.assertEqual(scalars['y'].steps.dtype, np.int64)
+
+    def test_corrupted(self):
+        with Logger('log_path') as log:
+            for i in range(100):
+                log.log_scalar('x', i, i)
+            filename = log.filename
+
+        with open(filename, 'rb') as file:
+            data = bytearray(file.read())
+        data[-6] ^= 1
+        with open(filename, 'wb') as file:
+            file.write(data)
+
+        with self.assertRaises(ValueError):
+            read_scalars(filename, verify=True)
+        self.assertEqual(len(read_scalars(filename)['x'].steps), 100)
+
+    def test_mixed_events(self):
+        os.makedirs('log_path', exist_ok=True)
+        filename = 'log_path/events.out.tfevents.mixed'
+        writer = EventFileWriter(filename)
+        expected = {}
+
+        def write(record, wall_time, step, tags, values):
+            writer.write(record)
+            for tag, value in zip(tags, values):
+                expected.setdefault(tag, []).append((step, wall_time, value))
+
+        steps = [0, 1, 127, 128, 2 ** 30, 2 ** 56, 2 ** 62, -5] * 20
+        for i, step in enumerate(steps):
+            wall_time = 0 if i == 3 else 1510000000 + i
+            tag = 'y' * (i % 3)
+            write(encode_scalar_event(wall_time, step, 'x', i), wall_time, step, ['x'], [i])
+            write(encode_scalar_event(wall_time, step, tag, -i), wall_time, step, [tag], [-i])
+            write(encode_scalars_event(wall_time, step, ['x', 'z'], [i, 2]), wall_time, step, ['x', 'z'], [i, 2])
+            if i % 7 == 0:
+                with Logger('log_path/other') as log:
+                    log.log_text('x', 'text', step)
+                    log.log_histogram('x', np.random.rand(10), step)
+                    other = log.filename
+                for record in read_records(other):
+                    writer.write(record)
+        # an incomplete record
+        writer.file.write(encode_scalar_event(1, 1, 'x', 1)[:10])
+        writer.close()
+
+        for tags in [None, ['x', 'yy'], []]:
+            scalars = read_scalars(filename, tags=tags)
+            self.assertEqual(set(scalars), set(expected) if tags is None else set(tags) & set(expected))
+            for tag, columns in scalars.items():
+                steps, wall_times, values = map(list, zip(*expected[tag]))
+                np.testing.assert_array_equal(columns.steps, steps)
+                np.testing.assert_array_equal(columns.wall_times, wall_times)
+                np.testing.assert_array_equal(columns.values, np.float32(values))
@@ -0,0 +1,59 @@
+import os
+import shutil
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from tensorboard_easy import Logger
+from tensorboard_easy import report
+from tensorboard_easy.report import summarize_runs, main
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree('log_path/report', ignore_errors=True)
+        for run in range(4):
+            with Logger('log_path/report/run%d' % run) as log:
+                for i in range(10):
+                    log.log_scalar('loss', 10 - i + run, i)
+                    log.log_scalar('accuracy', i * run, i)
+
+    def test_summary(self):
+        for processes in [1, 2]:
+            summary = summarize_runs('log_path/report', processes=processes)
+            self.assertEqual(set(summary), {'run0', 'run1', 'run2', 'run3'})
+            self.assertEqual(summary['run2']['loss'], {
+                'final': 3, 'best': 3, 'mean': 7.5, 'count': 10, 'final_step': 9,
+            })
+
+        summary = summarize_runs('log_path/report', tags=['accuracy'], mode='max', processes=1)
+        self.assertEqual(summary['run3'], {'accuracy': {
+            'final': 27, 'best': 27, 'mean': 13.5, 'count': 10, 'final_step': 9,
+        }})
+
+    def test_cache(self):
+        cache = 'log_path/report/cache.json'
+        summarize_runs('log_path/report', processes=1, cache_path=cache)
+        self.assertTrue(os.path.exists(cache))
+
+        # a new file in a run is merged with the cached ones
+        with Logger('log_path/report/run1') as log:
+            log.log_scalar('loss', -1, 10)
+            filename = log.filename
+        with mock.patch('tensorboard_easy.report.summarize_file', wraps=report.summarize_file) as summarize_file:
+            summary = summarize_runs('log_path/report', processes=1, cache_path=cache)
+        # only the new file is parsed
+        self.assertEqual([os.path.abspath(args[0]) for args, _ in summarize_file.call_args_list],
+                         [os.path.abspath(filename)])
+        self.assertEqual(summary['run1']['loss']['final'], -1)
+        self.assertEqual(summary['run1']['loss']['count'], 11)
+        self.assertEqual(summary['run0']['loss']['count'], 10)
+
+    def test_main(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            main(['log_path/report', '--tags', 'loss', '--processes', '1', '--no-cache'])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'run,tag,final,best,mean,count,final_step')
+        self.assertEqual(len(lines), 5)
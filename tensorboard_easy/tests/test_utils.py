@@ -0,0 +1,33 @@
+import os
+import unittest
+
+from tensorboard_easy import utils
+
+
+class TestCrc(unittest.TestCase):
+    def test_backends(self):
+        self.assertIn('numpy', utils.CRC_BACKENDS)
+        self.assertIn('crccheck', utils.CRC_BACKENDS)
+
+        for name, crc in utils.CRC_BACKENDS.items():
+            self.assertEqual(crc(b'123456789'), 0xe3069283, name)
+
+        for size in [0, 1, 7, 8, 100, utils.LANES_THRESHOLD - 1, utils.LANES_THRESHOLD,
+                     100003]:
+            data = os.urandom(size)
+            expected = utils.crc32c_crccheck(data)
+            for name, crc in utils.CRC_BACKENDS.items():
+                self.assertEqual(crc(data), expected, (name, size))
+
+    def test_set_backend(self):
+        default = utils.get_crc_backend()
+        try:
+            for name in utils.CRC_BACKENDS:
+                utils.set_crc_backend(name)
+                self.assertEqual(utils.get_crc_backend(), name)
+                self.assertEqual(utils.encode(b'data'), 0x9e264888)
+        finally:
+            utils.set_crc_backend(default)
+
+        with self.assertRaises(ValueError):
+            utils.set_crc_backend('unknown')
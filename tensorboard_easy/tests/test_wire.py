@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from tensorboard_easy.proto.event_pb2 import Event, SessionLog
+from tensorboard_easy.proto.summary_pb2 import Summary, HistogramProto, SummaryMetadata
+from tensorboard_easy.proto.tensor_pb2 import TensorProto
+from tensorboard_easy.proto.tensor_shape_pb2 import TensorShapeProto
+from tensorboard_easy.wire import encode_scalar_event, encode_scalars_event, encode_event, \
+    encode_histogram_value, encode_image_value, encode_audio_value, encode_tensor_event, iterate_fields, \
+    encode_text_value, encode_metadata, encode_file_version_event, encode_session_log_event
+
+WALL_TIMES = [0, 1.5, 1510000000.123456]
+STEPS = [0, 1, 127, 128, 300, 2 ** 40, -1]
+TAGS = ['', 'loss', 'train/accuracy', 'юникод', 'x' * 200]
+VALUES = [0, -0., 1, -1.5, 1e-40, 1e40, -1e40, float('inf'), 3.14159]
+
+
+def reference(wall_time, step, **kwargs):
+    summary = Summary()
+    for tag, value in kwargs.pop('values'):
+        summary.value.add(tag=tag, **value)
+    return Event(wall_time=wall_time, step=step, summary=summary).SerializeToString()
+
+
+class TestWire(unittest.TestCase):
+    def test_scalar(self):
+        for wall_time in WALL_TIMES:
+            for step in STEPS:
+                for tag in TAGS:
+                    for value in VALUES:
+                        self.assertEqual(
+                            encode_scalar_event(wall_time, step, tag, value),
+                            reference(wall_time, step, values=[(tag, dict(simple_value=value))]),
+                            (wall_time, step, tag, value)
+                        )
+
+    def test_scalars(self):
+        self.assertEqual(
+            encode_scalars_event(10, 5, TAGS, VALUES),
+            reference(10, 5, values=[(tag, dict(simple_value=value)) for tag, value in zip(TAGS, VALUES)])
+        )
+        self.assertEqual(encode_scalars_event(10, 5, [], []), reference(10, 5, values=[]))
+
+    def test_numpy_steps(self):
+        for step in STEPS:
+            for dtype in [np.int32, np.int64, np.uint64]:
+                info = np.iinfo(dtype)
+                if not info.min <= step <= info.max:
+                    continue
+                self.assertEqual(encode_scalar_event(10, dtype(step), 'loss', 1),
+                                 encode_scalar_event(10, step, 'loss', 1), (step, dtype))
+
+    def test_histogram(self):
+        data = np.random.normal(size=1000)
+        bucket, bucket_limit = np.histogram(data, 30)
+        cases = [
+            [data.min(), data.max(), 31, data.sum(), data.dot(data), bucket_limit[1:], bucket],
+            [0, 0, 1, 0, 0, [0], [100]],
+            [1, 1, 0, 0, 0, [], []],
+        ]
+        for step in STEPS:
+            for tag in TAGS:
+                for min_, max_, num, sum_, sum_sq, limits, counts in cases:
+                    value = encode_histogram_value(tag, min_, max_, num, sum_, sum_sq, limits, counts)
+                    hist = HistogramProto(min=min_, max=max_, num=num, sum=sum_, sum_squares=sum_sq,
+                                          bucket_limit=limits, bucket=counts)
+                    self.assertEqual(encode_event(100, step, [value]),
+                                     reference(100, step, values=[(tag, dict(histo=hist))]))
+
+    def test_image(self):
+        for tag in TAGS:
+            for height, width, colorspace, data in [(0, 0, 0, b''), (20, 300, 3, b'\x00' * 1000),
+                                                    (1, 1, 1, b'abc')]:
+                value = encode_image_value(tag, height, width, colorspace, data)
+                image = Summary.Image(height=height, width=width, colorspace=colorspace,
+                                      encoded_image_string=data)
+                self.assertEqual(encode_event(100, 1, [value]),
+                                 reference(100, 1, values=[(tag, dict(image=image))]))
+
+    def test_audio(self):
+        for tag in TAGS:
+            for rate, channels, frames, data, content_type in [
+                (0, 0, 0, b'', ''), (44100, 2, 1000, b'\x00' * 4000, 'audio/wav'), (8000.5, 1, 1, b'ab', 'x')
+            ]:
+                value = encode_audio_value(tag, rate, channels, frames, data, content_type)
+                audio = Summary.Audio(sample_rate=rate, num_channels=channels, length_frames=frames,
+                                      encoded_audio_string=data, content_type=content_type)
+                self.assertEqual(encode_event(100, 1, [value]),
+                                 reference(100, 1, values=[(tag, dict(audio=audio))]))
+
+    def test_tensor(self):
+        for step in STEPS:
+            for tag in TAGS:
+                for shape in [(), (0,), (3, 0, 2)]:
+                    tensor = TensorProto(dtype=1, version_number=1, tensor_shape=TensorShapeProto(
+                        dim=[TensorShapeProto.Dim(size=size) for size in shape]))
+                    self.assertEqual(encode_tensor_event(100, step, tag, 1, shape, b''),
+                                     reference(100, step, values=[(tag, dict(tensor=tensor))]))
+
+        # the vendored TensorProto has no `tensor_content`, so it is extracted manually
+        array = np.random.normal(size=(10, 300)).astype(np.float32)
+        event = encode_tensor_event(100, 1, 'tensor', 1, array.shape, array)
+        value = Event.FromString(event).summary.value[0]
+        self.assertEqual(value.tag, 'tensor')
+        self.assertEqual([dim.size for dim in value.tensor.tensor_shape.dim], [10, 300])
+
+        fields = dict((number, value) for number, _, value in iterate_fields(event))
+        fields = dict((number, value) for number, _, value in iterate_fields(fields[5]))
+        fields = dict((number, value) for number, _, value in iterate_fields(fields[1]))
+        fields = dict((number, value) for number, _, value in iterate_fields(fields[8]))
+        np.testing.assert_array_equal(np.frombuffer(fields[4], '<f4').reshape(10, 300), array)
+
+    def test_text(self):
+        metadata = SummaryMetadata()
+        metadata.plugin_data.add(plugin_name='text', content='{}')
+        self.assertEqual(encode_metadata('text', '{}'), metadata.SerializeToString())
+        self.assertEqual(encode_metadata('', ''), SummaryMetadata(plugin_data=[{}]).SerializeToString())
+
+        for tag in TAGS:
+            for strings in [np.array(b'text'), np.array([b'', b'a', 'юникод'.encode('utf-8')]),
+                            np.array([[b'a', b'b'], [b'c', b'd']]), np.array([], dtype=bytes)]:
+                shape = TensorShapeProto(dim=[TensorShapeProto.Dim(size=size) for size in strings.shape])
+                tensor = TensorProto(dtype=7, version_number=1, tensor_shape=shape, string_val=strings.ravel())
+                for meta in [None, metadata]:
+                    expected = dict(tensor=tensor) if meta is None else dict(tensor=tensor, metadata=meta)
+                    value = encode_text_value(tag, strings.ravel().tolist(), strings.shape,
+                                              b'' if meta is None else meta.SerializeToString())
+                    self.assertEqual(encode_event(100, 1, [value]), reference(100, 1, values=[(tag, expected)]))
+
+    def test_service_events(self):
+        for wall_time in WALL_TIMES:
+            self.assertEqual(encode_file_version_event(wall_time),
+                             Event(wall_time=wall_time, file_version='brain.Event:2').SerializeToString())
+            for step in STEPS:
+                for status in [SessionLog.STATUS_UNSPECIFIED, SessionLog.START, SessionLog.STOP]:
+                    self.assertEqual(encode_session_log_event(wall_time, step, status), Event(
+                        wall_time=wall_time, step=step, session_log=SessionLog(status=status)
+                    ).SerializeToString())
@@ -0,0 +1,152 @@
+import os
+import threading
+import unittest
+from time import sleep
+
+import numpy as np
+
+from tensorboard_easy import Logger
+from tensorboard_easy.reader import read_records
+from tensorboard_easy.writer import EventFileWriter, AsyncEventFileWriter
+
+
+class SlowWriter(EventFileWriter):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.release = threading.Event()
+
+    def write_many(self, records):
+        self.release.wait()
+        super().write_many(records)
+
+
+class TestWriter(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('log_path', exist_ok=True)
+
+    def test_async_same_output(self):
+        records = [str(i).encode() * i for i in range(100)]
+
+        writer = EventFileWriter('log_path/sync')
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+        writer = AsyncEventFileWriter(EventFileWriter('log_path/async'), max_queue=10)
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+        with open('log_path/sync', 'rb') as sync, open('log_path/async', 'rb') as async_:
+            self.assertEqual(sync.read(), async_.read())
+
+    def test_write_many(self):
+        records = [str(i).encode() * i for i in range(100)] + [b'x' * (1 << 20)]
+
+        writer = EventFileWriter('log_path/single')
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+        writer = EventFileWriter('log_path/many', flush_events=None)
+        writer.write_many(records[:10])
+        writer.write_many([])
+        writer.write_many(records[10:])
+        writer.close()
+
+        with open('log_path/single', 'rb') as single, open('log_path/many', 'rb') as many:
+            self.assertEqual(single.read(), many.read())
+        self.assertEqual(list(read_records('log_path/many')), records)
+
+    def test_flush(self):
+        writer = AsyncEventFileWriter(EventFileWriter('log_path/flush'))
+        writer.write(b'data')
+        writer.flush()
+        self.assertEqual(os.path.getsize('log_path/flush'), 4 + 16)
+        writer.close()
+
+    def test_flush_policy(self):
+        writer = EventFileWriter('log_path/events', flush_events=3)
+        for i in range(2):
+            writer.write(b'data')
+        self.assertEqual(os.path.getsize('log_path/events'), 0)
+        writer.write(b'data')
+        self.assertEqual(os.path.getsize('log_path/events'), 3 * 20)
+        writer.close()
+
+        writer = EventFileWriter('log_path/bytes', flush_events=None, flush_bytes=50)
+        writer.write(b'data')
+        writer.write(b'data')
+        self.assertEqual(os.path.getsize('log_path/bytes'), 0)
+        writer.write(b'data' * 10)
+        self.assertEqual(os.path.getsize('log_path/bytes'), 2 * 20 + 56)
+        writer.close()
+
+        writer = EventFileWriter('log_path/close', flush_events=None)
+        for i in range(10):
+            writer.write(b'data')
+        self.assertEqual(os.path.getsize('log_path/close'), 0)
+        writer.close()
+        self.assertEqual(os.path.getsize('log_path/close'), 10 * 20)
+
+    def test_flush_secs(self):
+        writer = AsyncEventFileWriter(EventFileWriter('log_path/secs', None, flush_secs=.1))
+        writer.write(b'data')
+        sleep(.5)
+        self.assertEqual(os.path.getsize('log_path/secs'), 20)
+        writer.close()
+
+        # without the background thread the timer flushes the last records
+        writer = EventFileWriter('log_path/secs', None, flush_secs=.1)
+        for i in range(3):
+            writer.write(b'data')
+            self.assertEqual(os.path.getsize('log_path/secs'), 0)
+        sleep(.5)
+        self.assertEqual(os.path.getsize('log_path/secs'), 60)
+        writer.write(b'data')
+        sleep(.5)
+        self.assertEqual(os.path.getsize('log_path/secs'), 80)
+        writer.close()
+
+    def test_overflow(self):
+        for overflow in ['drop_oldest', 'drop_newest']:
+            slow = SlowWriter('log_path/' + overflow)
+            writer = AsyncEventFileWriter(slow, max_queue=2, overflow=overflow)
+            for i in range(10):
+                writer.write(b'x')
+            slow.release.set()
+            writer.close()
+            # the thread could take up to `max_queue` records before blocking
+            self.assertIn(writer.dropped, [6, 7, 8])
+
+        with self.assertRaises(ValueError):
+            AsyncEventFileWriter(EventFileWriter('log_path/error'), overflow='unknown')
+
+    def test_async_logger(self):
+        try:
+            with Logger('log_path', async_write=True) as log:
+                for i in range(100):
+                    log.log_scalar('test_async', i, i)
+                log.flush()
+        except BaseException:
+            self.fail()
+
+    def test_logger_errors(self):
+        path = 'log_path/errors'
+        for options in [dict(overflow='unknown'), dict(max_queue=0)]:
+            with self.assertRaises(ValueError):
+                Logger(path, async_write=True, image_workers=2, **options)
+        # nothing is created
+        self.assertFalse(os.path.exists(path))
+
+        for async_write in [False, True]:
+            for image_workers in [0, 2]:
+                log = Logger(path, async_write=async_write, image_workers=image_workers)
+                log.close()
+                log.close()
+                with self.assertRaises(ValueError):
+                    log.log_scalar('scalar', 1, 0)
+                with self.assertRaises(ValueError):
+                    log.log_image('image', np.zeros((3, 3)), 0)
+                with self.assertRaises(ValueError):
+                    log.flush()
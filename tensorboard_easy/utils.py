@@ -1,11 +1,163 @@
+import struct
+from functools import lru_cache
+
+import numpy as np
 from crccheck.crc import Crc32c
 
+try:
+    import crc32c as _crc32c
+except ImportError:
+    _crc32c = None
+
+# reversed Castagnoli polynomial
+POLYNOMIAL = 0x82f63b78
+MASK = 0xffffffff
+LANES_THRESHOLD = 1 << 15
+
 
 def apply_and(x):
-    return x & 0xffffffff
+    return x & MASK
+
+
+def _make_tables():
+    table = np.arange(256, dtype=np.uint32)
+    for _ in range(8):
+        table = np.where(table & 1, (table >> 1) ^ POLYNOMIAL, table >> 1).astype(np.uint32)
+
+    tables = [table]
+    for _ in range(7):
+        previous = tables[-1]
+        tables.append((previous >> 8) ^ table[previous & 0xff])
+    return np.stack(tables)
+
+
+# TABLES[k][i] - the crc register after processing byte `i` followed by `k` zero bytes
+TABLES = _make_tables()
+_LISTS = TABLES.tolist()
+
+
+def _crc_scalar(crc, data, start, stop):
+    """Updates the raw register `crc` with `data[start:stop]` using the slice-by-8 algorithm."""
+    t0, t1, t2, t3, t4, t5, t6, t7 = _LISTS
+    unpack = struct.Struct('<II').unpack_from
+
+    stop8 = start + (stop - start) // 8 * 8
+    for i in range(start, stop8, 8):
+        low, high = unpack(data, i)
+        low ^= crc
+        crc = t7[low & 0xff] ^ t6[(low >> 8) & 0xff] ^ t5[(low >> 16) & 0xff] ^ t4[low >> 24] ^ \
+            t3[high & 0xff] ^ t2[(high >> 8) & 0xff] ^ t1[(high >> 16) & 0xff] ^ t0[high >> 24]
+
+    for byte in data[stop8:stop]:
+        crc = t0[(crc ^ byte) & 0xff] ^ (crc >> 8)
+    return crc
+
+
+def _apply(matrix, vector):
+    """Applies a linear operator over GF(2), given by the images of the 32 bits, to an array of registers."""
+    result = np.zeros_like(vector)
+    for bit, column in enumerate(matrix):
+        result ^= ((vector >> np.uint32(bit)) & np.uint32(1)) * column
+    return result
+
+
+@lru_cache(64)
+def _shift_operator(length):
+    """The operator that appends `length` zero bytes to a raw crc register."""
+    result = np.array([1 << bit for bit in range(32)], dtype=np.uint32)
+    # a single zero byte
+    power = TABLES[0][result & 0xff] ^ (result >> 8)
+    while length:
+        if length & 1:
+            result = _apply(power, result)
+        length >>= 1
+        if length:
+            power = _apply(power, power)
+    return result
+
+
+def _crc_lanes(data, count, length):
+    """
+    Computes the raw register after `count` consecutive lanes of `length` bytes.
+    The lanes are processed in parallel and then combined.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = TABLES
+    words = np.frombuffer(data, '<u4', count * length // 4).reshape(count, length // 4)
+    crc = np.zeros(count, np.uint32)
+    # only the first lane starts from the initial value, the rest are combined linearly
+    crc[0] = MASK
+    for i in range(0, length // 4, 2):
+        low = words[:, i] ^ crc
+        high = words[:, i + 1]
+        crc = t7[low & 0xff] ^ t6[(low >> 8) & 0xff] ^ t5[(low >> 16) & 0xff] ^ t4[low >> 24] ^ \
+            t3[high & 0xff] ^ t2[(high >> 8) & 0xff] ^ t1[(high >> 16) & 0xff] ^ t0[high >> 24]
+
+    # leading zero registers don't change the result, so the lanes are padded to a power of two
+    crc = np.concatenate([np.zeros((1 << (count - 1).bit_length()) - count, np.uint32), crc])
+    # pairwise reduction: crc(A + B) = shift(crc(A), len(B)) ^ crc(B)
+    shift = _shift_operator(length)
+    while len(crc) > 1:
+        crc = _apply(shift, crc[::2]) ^ crc[1::2]
+        shift = _apply(shift, shift)
+
+    return int(crc[0])
+
+
+def crc32c_numpy(data) -> int:
+    """
+    CRC32C based on slice-by-8 tables. Large buffers are split into lanes
+    that are processed simultaneously by NumPy and then combined.
+    """
+    data = memoryview(data).cast('B')
+    size = len(data)
+    # numpy's overhead pays off only for large buffers
+    if size < LANES_THRESHOLD:
+        return _crc_scalar(MASK, data, 0, size) ^ MASK
+
+    # balance the number of lanes and the number of steps per lane
+    length = int(np.sqrt(size / 8)) * 8
+    count = size // length
+
+    raw = _crc_lanes(data, count, length)
+    return _crc_scalar(raw, data, count * length, size) ^ MASK
+
+
+def crc32c_crccheck(data) -> int:
+    return Crc32c.calc(data)
+
+
+CRC_BACKENDS = {
+    'numpy': crc32c_numpy,
+    'crccheck': crc32c_crccheck,
+}
+if _crc32c is not None:
+    CRC_BACKENDS['crc32c'] = _crc32c.crc32c
+
+# use the fastest available backend by default
+_crc = CRC_BACKENDS.get('crc32c', crc32c_numpy)
+
+
+def set_crc_backend(name: str):
+    """
+    Chooses the CRC32C implementation used to write events.
+
+    Parameters
+    ----------
+    name: str
+        'crc32c' (requires the `crc32c` package), 'numpy' or 'crccheck'.
+    """
+    global _crc
+    try:
+        _crc = CRC_BACKENDS[name]
+    except KeyError:
+        raise ValueError('Unknown or unavailable CRC backend: %r' % name) from None
+
+
+def get_crc_backend() -> str:
+    return next(name for name, func in CRC_BACKENDS.items() if func is _crc)
 
 
 def encode(data):
-    data = Crc32c.calc(data)
+    data = _crc(data)
     temp = apply_and(data)
     return apply_and(((temp >> 15) | apply_and(temp << 17)) + 0xa282ead8)
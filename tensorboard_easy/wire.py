@@ -0,0 +1,402 @@
+"""
+Direct encoding of the most frequent events into the protobuf wire format.
+
+The output is byte-identical to `Event.SerializeToString` for the same content,
+but avoids building the intermediate message objects.
+"""
+import struct
+from operator import index
+from typing import Sequence
+
+import numpy as np
+
+_double = struct.Struct('<d').pack
+_float = struct.Struct('<f').pack
+_unpack_double = struct.Struct('<d').unpack
+_unpack_double_from = struct.Struct('<d').unpack_from
+_unpack_float_from = struct.Struct('<f').unpack_from
+
+# field keys: (number << 3) | wire type
+_EVENT_WALL_TIME = b'\x09'
+_EVENT_STEP = b'\x10'
+_EVENT_FILE_VERSION = b'\x1a'
+_EVENT_SUMMARY = b'\x2a'
+_EVENT_SESSION_LOG = b'\x3a'
+_SESSION_LOG_STATUS = b'\x08'
+_SUMMARY_VALUE = b'\x0a'
+_VALUE_TAG = b'\x0a'
+_VALUE_SIMPLE_VALUE = b'\x15'
+_VALUE_IMAGE = b'\x22'
+_VALUE_HISTO = b'\x2a'
+_VALUE_AUDIO = b'\x32'
+_VALUE_TENSOR = b'\x42'
+_VALUE_METADATA = b'\x4a'
+_METADATA_PLUGIN_DATA = b'\x0a'
+_PLUGIN_NAME = b'\x0a'
+_PLUGIN_CONTENT = b'\x12'
+_IMAGE_FIELDS = (b'\x08', b'\x10', b'\x18')
+_IMAGE_ENCODED = b'\x22'
+_AUDIO_SAMPLE_RATE = b'\x0d'
+_AUDIO_FIELDS = (b'\x10', b'\x18')
+_AUDIO_ENCODED = b'\x22'
+_AUDIO_CONTENT_TYPE = b'\x2a'
+_TENSOR_DTYPE = b'\x08'
+_TENSOR_SHAPE = b'\x12'
+_TENSOR_VERSION = b'\x18'
+_TENSOR_CONTENT = b'\x22'
+_TENSOR_STRING_VAL = b'\x42'
+_DT_STRING = 7
+_SHAPE_DIM = b'\x12'
+_DIM_SIZE = b'\x08'
+_HISTO_FIELDS = (b'\x09', b'\x11', b'\x19', b'\x21', b'\x29')
+_HISTO_BUCKET_LIMIT = b'\x32'
+_HISTO_BUCKET = b'\x3a'
+
+
+def varint(value: int) -> bytes:
+    # numpy integers would overflow on the mask below,
+    # negative numbers are encoded as 64-bit two's complement
+    value = index(value) & 0xffffffffffffffff
+    if value < 0x80:
+        return bytes((value,))
+
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _float32(value: float) -> bytes:
+    try:
+        return _float(value)
+    except OverflowError:
+        return _float(float('inf') if value > 0 else float('-inf'))
+
+
+def _field(key: bytes, payload: bytes) -> bytes:
+    return key + varint(len(payload)) + payload
+
+
+def _double_field(key: bytes, value: float) -> bytes:
+    # proto3 omits default values
+    if not value:
+        return b''
+    return key + _double(value)
+
+
+def _int_field(key: bytes, value: int) -> bytes:
+    if not value:
+        return b''
+    return key + varint(value)
+
+
+def _packed_doubles(key: bytes, values) -> bytes:
+    values = np.asarray(values, dtype='<f8')
+    if not values.size:
+        return b''
+    return _field(key, values.tobytes())
+
+
+def _tag(tag: str) -> bytes:
+    if not tag:
+        return b''
+    return _field(_VALUE_TAG, tag.encode('utf-8'))
+
+
+def _event_header(wall_time: float, step: int) -> bytes:
+    result = _double_field(_EVENT_WALL_TIME, wall_time)
+    if step:
+        result += _EVENT_STEP + varint(step)
+    return result
+
+
+def encode_event(wall_time: float, step: int, values: Sequence[bytes]) -> bytes:
+    """
+    Encodes an `Event` with a summary.
+
+    Parameters
+    ----------
+    wall_time: float
+    step: int
+    values: sequence of bytes
+        serialized `Summary.Value` messages.
+    """
+    summary = b''.join(_field(_SUMMARY_VALUE, value) for value in values)
+    return _event_header(wall_time, step) + _field(_EVENT_SUMMARY, summary)
+
+
+def encode_file_version_event(wall_time: float, file_version: str = 'brain.Event:2') -> bytes:
+    """Encodes the `Event` that starts an events file."""
+    return _event_header(wall_time, 0) + _field(_EVENT_FILE_VERSION, file_version.encode('utf-8'))
+
+
+def encode_session_log_event(wall_time: float, step: int, status: int) -> bytes:
+    """Encodes an `Event` with a `SessionLog` of the given status, e.g. `SessionLog.START`."""
+    session_log = _int_field(_SESSION_LOG_STATUS, status)
+    return _event_header(wall_time, step) + _field(_EVENT_SESSION_LOG, session_log)
+
+
+def encode_scalar_value(tag: str, value: float) -> bytes:
+    """Encodes a `Summary.Value` with a `simple_value`."""
+    return _tag(tag) + _VALUE_SIMPLE_VALUE + _float32(value)
+
+
+def encode_histogram_value(tag: str, min_: float, max_: float, num: float, sum_: float,
+                           sum_squares: float, bucket_limit, bucket) -> bytes:
+    """Encodes a `Summary.Value` with a `HistogramProto`."""
+    histo = b''.join(_double_field(key, float(value)) for key, value in
+                     zip(_HISTO_FIELDS, [min_, max_, num, sum_, sum_squares]))
+    histo += _packed_doubles(_HISTO_BUCKET_LIMIT, bucket_limit)
+    histo += _packed_doubles(_HISTO_BUCKET, bucket)
+    return _tag(tag) + _field(_VALUE_HISTO, histo)
+
+
+def encode_image_value(tag: str, height: int, width: int, colorspace: int, encoded_image: bytes) -> bytes:
+    """Encodes a `Summary.Value` with a `Summary.Image`."""
+    image = b''.join(_int_field(key, value) for key, value in
+                     zip(_IMAGE_FIELDS, [height, width, colorspace]))
+    if encoded_image:
+        image += _field(_IMAGE_ENCODED, encoded_image)
+    return _tag(tag) + _field(_VALUE_IMAGE, image)
+
+
+def encode_audio_value(tag: str, sample_rate: float, num_channels: int, length_frames: int,
+                       encoded_audio: bytes, content_type: str = 'audio/wav') -> bytes:
+    """Encodes a `Summary.Value` with a `Summary.Audio`."""
+    audio = _AUDIO_SAMPLE_RATE + _float32(sample_rate) if sample_rate else b''
+    audio += b''.join(_int_field(key, value) for key, value in
+                      zip(_AUDIO_FIELDS, [num_channels, length_frames]))
+    if encoded_audio:
+        audio += _field(_AUDIO_ENCODED, encoded_audio)
+    if content_type:
+        audio += _field(_AUDIO_CONTENT_TYPE, content_type.encode('utf-8'))
+    return _tag(tag) + _field(_VALUE_AUDIO, audio)
+
+
+def encode_metadata(plugin_name: str, content: str = '') -> bytes:
+    """Encodes a `SummaryMetadata` with a single plugin."""
+    plugin = b''
+    if plugin_name:
+        plugin += _field(_PLUGIN_NAME, plugin_name.encode('utf-8'))
+    if content:
+        plugin += _field(_PLUGIN_CONTENT, content.encode('utf-8'))
+    return _field(_METADATA_PLUGIN_DATA, plugin)
+
+
+def _tensor_header(dtype: int, shape: Sequence[int]) -> bytes:
+    header = _int_field(_TENSOR_DTYPE, dtype)
+    header += _field(_TENSOR_SHAPE, b''.join(_field(_SHAPE_DIM, _int_field(_DIM_SIZE, size)) for size in shape))
+    return header + _int_field(_TENSOR_VERSION, 1)
+
+
+def encode_text_value(tag: str, strings: Sequence[bytes], shape: Sequence[int], metadata: bytes = b'') -> bytes:
+    """
+    Encodes a `Summary.Value` with a string `TensorProto`.
+
+    Parameters
+    ----------
+    tag: str
+    strings: sequence of bytes
+        the values of the tensor in row-major order.
+    shape: sequence of int
+    metadata: bytes, optional
+        a serialized `SummaryMetadata`, see `encode_metadata`.
+    """
+    tensor = _tensor_header(_DT_STRING, shape) + b''.join(_field(_TENSOR_STRING_VAL, value) for value in strings)
+    value = _tag(tag) + _field(_VALUE_TENSOR, tensor)
+    if metadata:
+        value += _field(_VALUE_METADATA, metadata)
+    return value
+
+
+def encode_tensor_event(wall_time: float, step: int, tag: str, dtype: int, shape: Sequence[int],
+                        content) -> bytes:
+    """
+    Encodes an `Event` with a single `TensorProto` stored in `tensor_content`.
+
+    Parameters
+    ----------
+    wall_time: float
+    step: int
+    tag: str
+    dtype: int
+        the `DataType` of the tensor.
+    shape: sequence of int
+    content: bytes-like
+        the raw little-endian values in row-major order. It is copied only once, into the result.
+    """
+    content = memoryview(content)
+    size = content.nbytes
+    tensor = _tensor_header(dtype, shape)
+    # the nested messages are prefixed by their lengths, so the content is appended at the very end
+    if size:
+        tensor += _TENSOR_CONTENT + varint(size)
+    value = _tag(tag) + _VALUE_TENSOR + varint(len(tensor) + size) + tensor
+    summary = _SUMMARY_VALUE + varint(len(value) + size) + value
+
+    event = _event_header(wall_time, step)
+    event += _EVENT_SUMMARY + varint(len(summary) + size) + summary
+    return b''.join([event, content])
+
+
+def encode_scalar_event(wall_time: float, step: int, tag: str, value: float) -> bytes:
+    return encode_event(wall_time, step, [encode_scalar_value(tag, value)])
+
+
+def encode_scalars_event(wall_time: float, step: int, tags: Sequence[str],
+                         values: Sequence[float]) -> bytes:
+    return encode_event(wall_time, step, [encode_scalar_value(tag, value)
+                                          for tag, value in zip(tags, values)])
+
+
+def _read_varint(data, position: int):
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def iterate_fields(data):
+    """
+    Iterates over the top-level fields of a serialized message.
+
+    Yields triplets (field number, wire type, value), where value is an int for varints
+    and a slice of `data` for the other wire types.
+    """
+    data = memoryview(data)
+    position, size = 0, len(data)
+    while position < size:
+        key, position = _read_varint(data, position)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, position = _read_varint(data, position)
+        elif wire_type == 1:
+            value, position = data[position:position + 8], position + 8
+        elif wire_type == 2:
+            length, position = _read_varint(data, position)
+            value, position = data[position:position + length], position + length
+        elif wire_type == 5:
+            value, position = data[position:position + 4], position + 4
+        else:
+            raise ValueError('Unsupported wire type: %d' % wire_type)
+
+        yield number, wire_type, value
+
+
+def _find_string(data, number: int) -> str:
+    for field, kind, value in iterate_fields(data):
+        if field == number and kind == 2:
+            return bytes(value).decode('utf-8')
+    return ''
+
+
+def decode_event_header(data):
+    """
+    Extracts the wall time, the step and the summary tags from a serialized `Event`
+    without decoding the rest of it.
+
+    Returns
+    -------
+    wall_time: float
+    step: int
+    tags: list of str
+    """
+    wall_time, step, tags = 0., 0, []
+    for number, wire_type, value in iterate_fields(data):
+        if number == 1 and wire_type == 1:
+            wall_time = _unpack_double(value)[0]
+        elif number == 2 and wire_type == 0:
+            step = value - (1 << 64) if value >> 63 else value
+        elif number == 5 and wire_type == 2:
+            for field, kind, summary_value in iterate_fields(value):
+                if field == 1 and kind == 2:
+                    tags.append(_find_string(summary_value, 1))
+
+    return wall_time, step, tags
+
+
+def _skip(data, position: int, wire_type: int) -> int:
+    if wire_type == 0:
+        return _read_varint(data, position)[1]
+    if wire_type == 1:
+        return position + 8
+    if wire_type == 2:
+        length, position = _read_varint(data, position)
+        return position + length
+    if wire_type == 5:
+        return position + 4
+    raise ValueError('Unsupported wire type: %d' % wire_type)
+
+
+def _decode_scalar_value(data, position: int, stop: int):
+    tag, scalar = '', None
+    while position < stop:
+        key = data[position]
+        position += 1
+        if key == 0x0a:
+            length, position = _read_varint(data, position)
+            tag = bytes(data[position:position + length]).decode('utf-8')
+            position += length
+        elif key == 0x15:
+            scalar = _unpack_float_from(data, position)[0]
+            position += 4
+        else:
+            if key >= 0x80:
+                key, position = _read_varint(data, position - 1)
+            position = _skip(data, position, key & 7)
+
+    return tag, scalar
+
+
+def decode_scalars(data):
+    """
+    Extracts the wall time, the step and the scalar values from a serialized `Event`.
+    All the other summary values are skipped without decoding.
+
+    Returns
+    -------
+    wall_time: float
+    step: int
+    scalars: list of pairs (tag, value)
+    """
+    # this function is on the hot path of exporting, so the keys are matched directly
+    wall_time, step, scalars = 0., 0, []
+    position, size = 0, len(data)
+    while position < size:
+        key = data[position]
+        position += 1
+        if key == 0x09:
+            wall_time = _unpack_double_from(data, position)[0]
+            position += 8
+        elif key == 0x10:
+            step, position = _read_varint(data, position)
+            if step >> 63:
+                step -= 1 << 64
+        elif key == 0x2a:
+            length, position = _read_varint(data, position)
+            stop = position + length
+            while position < stop:
+                key = data[position]
+                position += 1
+                if key == 0x0a:
+                    length, position = _read_varint(data, position)
+                    tag, scalar = _decode_scalar_value(data, position, position + length)
+                    if scalar is not None:
+                        scalars.append((tag, scalar))
+                    position += length
+                else:
+                    if key >= 0x80:
+                        key, position = _read_varint(data, position - 1)
+                    position = _skip(data, position, key & 7)
+        else:
+            if key >= 0x80:
+                key, position = _read_varint(data, position - 1)
+            position = _skip(data, position, key & 7)
+
+    return wall_time, step, scalars
@@ -0,0 +1,248 @@
+import struct
+import threading
+from time import monotonic
+from collections import deque
+
+from .utils import encode
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+_length = struct.Struct('<Q')
+_crc = struct.Struct('<I')
+
+
+def check_queue_options(max_queue: int, overflow: str):
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError('Unknown overflow policy: %r' % overflow)
+    if max_queue < 1:
+        raise ValueError('max_queue must be positive')
+
+
+def _frame(record: bytes):
+    """The parts of a framed record: the length, its CRC, the data and its CRC."""
+    header = _length.pack(len(record))
+    return header, _crc.pack(encode(header)), record, _crc.pack(encode(record))
+
+
+class EventFileWriter:
+    """
+    Writes serialized events to a file as length-prefixed, CRC-protected records.
+
+    The records are buffered and flushed to disk according to the flush policy.
+    If all of `flush_events`, `flush_bytes` and `flush_secs` are None,
+    the file is flushed only by an explicit call to `flush` or `close`.
+
+    The writer is thread-safe: the records are framed into a single bytes object by `b''.join`
+    outside of the lock, and then committed to the file by a single `write` under the lock.
+
+    Parameters
+    ----------
+    filename: str
+    flush_events: int, optional
+        flush after this many records.
+    flush_bytes: int, optional
+        flush after this many bytes.
+    flush_secs: float, optional
+        flush if this many seconds have passed since the last flush. A timer thread makes sure
+        that the records are flushed in time, even if nothing is written afterwards.
+    """
+
+    def __init__(self, filename: str, flush_events: int = 1, flush_bytes: int = None,
+                 flush_secs: float = None):
+        self.filename = filename
+        self.flush_events = flush_events
+        self.flush_bytes = flush_bytes
+        self.flush_secs = flush_secs
+        self.file = open(filename, 'wb')
+        self._unflushed_events = self._unflushed_bytes = 0
+        self._last_flush = monotonic()
+        self._lock = threading.RLock()
+        self._timer = None
+
+    def write(self, record: bytes):
+        self._commit(b''.join(_frame(record)), 1)
+
+    def write_many(self, records):
+        """Writes several records by a single call. The flush policy is applied after all of them."""
+        if not records:
+            return
+        parts = []
+        for record in records:
+            parts.extend(_frame(record))
+        self._commit(b''.join(parts), len(records))
+
+    def _commit(self, framed: bytes, count: int):
+        with self._lock:
+            self.file.write(framed)
+
+            self._unflushed_events += count
+            self._unflushed_bytes += len(framed)
+            if (self.flush_events is not None and self._unflushed_events >= self.flush_events) or \
+                    (self.flush_bytes is not None and self._unflushed_bytes >= self.flush_bytes):
+                self.flush()
+            else:
+                self.poll()
+                self._start_timer()
+
+    def _start_timer(self):
+        if self.flush_secs is not None and self._unflushed_events and self._timer is None:
+            self._timer = threading.Timer(self.seconds_to_flush(), self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            # the timer could have been cancelled while waiting for the lock
+            if self._timer is not threading.current_thread():
+                return
+            self._timer = None
+            self.poll()
+            self._start_timer()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def poll(self):
+        """Flushes the file if `flush_secs` have passed since the last flush."""
+        with self._lock:
+            if self._unflushed_events and self.seconds_to_flush() == 0:
+                self.flush()
+
+    def seconds_to_flush(self):
+        """The time left until the next time-based flush, or None if there is nothing to wait for."""
+        if self.flush_secs is None or not self._unflushed_events:
+            return None
+        return max(0, self._last_flush + self.flush_secs - monotonic())
+
+    def flush(self):
+        with self._lock:
+            self._cancel_timer()
+            self.file.flush()
+            self._unflushed_events = self._unflushed_bytes = 0
+            self._last_flush = monotonic()
+
+    def close(self):
+        with self._lock:
+            self._cancel_timer()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class AsyncEventFileWriter:
+    """
+    Moves the framing and disk I/O of an `EventFileWriter` to a background thread.
+
+    Parameters
+    ----------
+    writer: EventFileWriter
+    max_queue: int, optional
+        the maximal number of records waiting to be written.
+    overflow: str, optional
+        what to do with a new record when the queue is full:
+        'block' - wait until the writer thread frees a slot,
+        'drop_oldest' - discard the oldest pending record,
+        'drop_newest' - discard the new record.
+    """
+
+    def __init__(self, writer: EventFileWriter, max_queue: int = 1024, overflow: str = 'block'):
+        check_queue_options(max_queue, overflow)
+        self.writer = writer
+        self.max_queue = max_queue
+        self.overflow = overflow
+        # the number of records discarded due to overflow
+        self.dropped = 0
+
+        self._records = deque()
+        self._condition = threading.Condition()
+        self._flush_requested = self._flush_done = 0
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='EventFileWriter', daemon=True)
+        self._thread.start()
+
+    @property
+    def filename(self):
+        return self.writer.filename
+
+    def _check_error(self):
+        if self._error is not None:
+            raise RuntimeError('The writer thread has failed') from self._error
+
+    def write(self, record: bytes):
+        with self._condition:
+            self._check_error()
+            if self._closed:
+                raise ValueError('Writing to a closed writer')
+
+            if len(self._records) >= self.max_queue:
+                if self.overflow == 'drop_newest':
+                    self.dropped += 1
+                    return
+                if self.overflow == 'drop_oldest':
+                    self._records.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._records) >= self.max_queue and self._error is None:
+                        self._condition.wait()
+                    self._check_error()
+
+            self._records.append(record)
+            self._condition.notify_all()
+
+    def flush(self):
+        """Blocks until all the pending records are written and flushed to the file."""
+        with self._condition:
+            self._check_error()
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._condition.notify_all()
+            while self._flush_done < target and self._error is None and self._thread.is_alive():
+                self._condition.wait()
+            self._check_error()
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        self.writer.close()
+        self._check_error()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._records and self._flush_done == self._flush_requested and not self._closed:
+                    timeout = self.writer.seconds_to_flush()
+                    if timeout == 0:
+                        break
+                    self._condition.wait(timeout)
+
+                records = list(self._records)
+                self._records.clear()
+                flush_target = self._flush_requested
+                closed = self._closed
+                # wake up the producers waiting for free slots
+                self._condition.notify_all()
+
+            try:
+                self.writer.write_many(records)
+                if flush_target != self._flush_done:
+                    self.writer.flush()
+                else:
+                    self.writer.poll()
+            except BaseException as e:
+                with self._condition:
+                    self._error = e
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._flush_done = flush_target
+                self._condition.notify_all()
+                if closed and not self._records:
+                    return